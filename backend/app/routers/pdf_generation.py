@@ -12,7 +12,7 @@ from botocore.client import Config as BotoConfig
 
 from app.core.config import settings
 from app.schemas.slides import LecturePlan, SlideItem
-from app.services.slides.pdf_builder import build_pdf
+from app.services.slides.pdf_builder import build_pdf_to
 from app.services.slides.theme_tokens import get_theme
 from app.gemini_generator import generate_slides
 
@@ -31,6 +31,7 @@ class PDFGenerationRequest(BaseModel):
     device_preset: Optional[Literal["desktop", "tablet", "mobile"]] = None
     cheatsheet_only: bool = False
     notes_only: bool = False
+    draft: bool = False  # fast preview: no vignette, unexpanded bullet points
 
 
 class PDFGenerationResponse(BaseModel):
@@ -122,19 +123,19 @@ async def generate_pdf(req: PDFGenerationRequest, background_tasks: BackgroundTa
         # Get theme tokens
         theme = get_theme(theme_key)
         
-        # Generate PDF
-        pdf_bytes = build_pdf(
-            plan=plan,
-            theme=theme,
-            cheatsheet_only=req.cheatsheet_only,
-            notes_only=req.notes_only,
-        )
-        
-        # Save PDF locally
+        # Generate PDF straight into the local file (no in-memory copy)
         pdf_dir = OUTDIR / task_id
         pdf_dir.mkdir(parents=True, exist_ok=True)
         pdf_path = pdf_dir / f"{task_id}.pdf"
-        pdf_path.write_bytes(pdf_bytes)
+        with pdf_path.open("wb") as fh:
+            build_pdf_to(
+                plan=plan,
+                theme=theme,
+                out=fh,
+                cheatsheet_only=req.cheatsheet_only,
+                notes_only=req.notes_only,
+                draft=req.draft,
+            )
         
         # Upload to R2
         s3_key = f"edusynth/{task_id}/{task_id}.pdf"
@@ -1,5 +1,6 @@
 from __future__ import annotations
 
+import asyncio
 import io
 import uuid
 from typing import Optional, List
@@ -52,7 +53,6 @@ from app.services.slides.pdf_enhanced import build_enhanced_pdf
 
 router = APIRouter(prefix="/v1/slides", tags=["slides"])
 
-
 # -----------------------------------------------------------------------------
 # Models for responses
 # -----------------------------------------------------------------------------
@@ -106,7 +106,9 @@ async def export_pptx(
     your R2 upload is elsewhere in your codebase.
     """
     try:
-        pptx_bytes: bytes = build_pptx(plan, plan.theme)
+        # build_pptx resolves plan.theme itself when no theme dict is passed;
+        # build off the event loop so other requests keep being served meanwhile
+        pptx_bytes: bytes = await asyncio.to_thread(build_pptx, plan)
 
         # TODO: integrate your real R2 upload here; keeping a simple deterministic key:
         key = f"decks/{uuid.uuid4().hex}_{plan.topic.replace(' ', '_')}.pptx"
@@ -1,9 +1,14 @@
 from __future__ import annotations
 
 import math
+from functools import lru_cache
 from typing import List, Tuple
 
+import numpy as np
+from PIL import Image
 from reportlab.lib.colors import HexColor
+from reportlab.lib.utils import ImageReader
+from reportlab.pdfbase import pdfmetrics
 from reportlab.pdfgen import canvas
 
 # ---- color utils ----
@@ -11,14 +16,20 @@ from reportlab.pdfgen import canvas
 def _clamp01(x: float) -> float:
     return max(0.0, min(1.0, x))
 
+@lru_cache(maxsize=128)
 def _hex_to_rgb_tuple(hex_color: str) -> Tuple[int, int, int]:
     hc = hex_color.lstrip("#")
-    return tuple(int(hc[i:i+2], 16) for i in (0, 2, 4))
+    if len(hc) < 6:
+        raise ValueError(f"Invalid hex color: {hex_color}")
+    v = int(hc[:6], 16)
+    return ((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
 
+@lru_cache(maxsize=128)
 def hex_to_rgb(hex_color: str) -> Tuple[float, float, float]:
     r, g, b = _hex_to_rgb_tuple(hex_color)
     return (r/255.0, g/255.0, b/255.0)
 
+@lru_cache(maxsize=256)
 def lighten(hex_color: str, amount: float) -> str:
     r, g, b = _hex_to_rgb_tuple(hex_color)
     r = int(_clamp01(r/255.0 + amount) * 255)
@@ -26,6 +37,7 @@ def lighten(hex_color: str, amount: float) -> str:
     b = int(_clamp01(b/255.0 + amount) * 255)
     return f"#{r:02X}{g:02X}{b:02X}"
 
+@lru_cache(maxsize=256)
 def darken(hex_color: str, amount: float) -> str:
     r, g, b = _hex_to_rgb_tuple(hex_color)
     r = int(_clamp01(r/255.0 - amount) * 255)
@@ -33,6 +45,29 @@ def darken(hex_color: str, amount: float) -> str:
     b = int(_clamp01(b/255.0 - amount) * 255)
     return f"#{r:02X}{g:02X}{b:02X}"
 
+# ---- text metrics ----
+
+@lru_cache(maxsize=32)
+def _font(font_name: str):
+    """Resolve a registered font once; skips pdfmetrics' by-name lookup on every width."""
+    return pdfmetrics.getFont(font_name)
+
+@lru_cache(maxsize=32)
+def _ascii_widths(font_name: str) -> dict:
+    """Per-glyph advance at 1pt for ASCII; built-in faces have no kerning, so widths add."""
+    font = _font(font_name)
+    return {chr(i): font.stringWidth(chr(i), 1.0) for i in range(128)}
+
+@lru_cache(maxsize=4096)
+def _measure_cached(font_name: str, font_size: float, text: str) -> float:
+    if text.isascii():
+        return sum(map(_ascii_widths(font_name).__getitem__, text)) * font_size
+    return _font(font_name).stringWidth(text, font_size)
+
+def measure_text(text: str, font_name: str, font_size: float) -> float:
+    """Width of text in points; canvas-independent, so results are memoized."""
+    return _measure_cached(font_name, round(font_size, 2), text)
+
 # ---- geometry helpers ----
 
 def polar_to_xy(cx: float, cy: float, r: float, theta_rad: float) -> Tuple[float, float]:
@@ -46,20 +81,20 @@ def layout_radial(nodes: List[dict], radius: float, relax_iters: int = 4) -> Lis
     for i, theta in enumerate(base):
         w = nodes[i]["width"]; h = nodes[i]["height"]
         x, y = radius*math.cos(theta), radius*math.sin(theta)
-        coords.append([x, y, theta, w, h])
+        coords.append([x, y, theta, max(w, h) * 0.6])
 
     # very light repel to prevent overlaps
     for _ in range(relax_iters):
         for i in range(n):
-            xi, yi, thetai, wi, hi = coords[i]
-            ri = max(wi, hi) * 0.6
+            xi, yi, _, ri = coords[i]
             for j in range(i+1, n):
-                xj, yj, thetaj, wj, hj = coords[j]
-                rj = max(wj, hj) * 0.6
+                xj, yj, _, rj = coords[j]
                 dx, dy = xj - xi, yj - yi
-                dist = math.hypot(dx, dy) or 1.0
                 min_d = ri + rj + 12  # gutter
-                if dist < min_d:
+                d2 = dx*dx + dy*dy
+                # compare squared distances; only take the root when a push is needed
+                if d2 < min_d*min_d:
+                    dist = math.sqrt(d2) or 1.0
                     push = (min_d - dist) / 2.0
                     nx, ny = dx/dist, dy/dist
                     coords[i][0] -= nx * push
@@ -67,14 +102,14 @@ def layout_radial(nodes: List[dict], radius: float, relax_iters: int = 4) -> Lis
                     coords[j][0] += nx * push
                     coords[j][1] += ny * push
 
-    return [(x, y, theta) for x, y, theta, _, _ in coords]
+    return [(x, y, theta) for x, y, theta, _ in coords]
 
 # ---- drawing helpers ----
 
 def rounded_rect(c: canvas.Canvas, x: float, y: float, w: float, h: float, r: float, fill: bool=False, stroke: bool=False):
     c.roundRect(x, y, w, h, r, stroke=1 if stroke else 0, fill=1 if fill else 0)
 
-def draw_bezier_connector(c: canvas.Canvas, x0: float, y0: float, x1: float, y1: float, t_bias: float = 0.5):
+def _add_connector(p, x0: float, y0: float, x1: float, y1: float, t_bias: float = 0.5):
     # control points pulled towards the middle for a nice bow
     mx = (x0 + x1) / 2.0
     my = (y0 + y1) / 2.0
@@ -82,67 +117,121 @@ def draw_bezier_connector(c: canvas.Canvas, x0: float, y0: float, x1: float, y1:
     cy1 = (y0 * (1 - t_bias)) + (my * t_bias)
     cx2 = (x1 * (1 - t_bias)) + (mx * t_bias)
     cy2 = (y1 * (1 - t_bias)) + (my * t_bias)
-
-    p = c.beginPath()
     p.moveTo(x0, y0)
     p.curveTo(cx1, cy1, cx2, cy2, x1, y1)
+
+def _add_arrow_head(p, x0: float, y0: float, x1: float, y1: float, head: float):
+    # tiny arrow head
+    angle = math.atan2(y1-y0, x1-x0)
+    p.moveTo(x1, y1)
+    p.lineTo(x1 - head*math.cos(angle - 0.4), y1 - head*math.sin(angle - 0.4))
+    p.lineTo(x1 - head*math.cos(angle + 0.4), y1 - head*math.sin(angle + 0.4))
+    p.close()
+
+def draw_bezier_connector(c: canvas.Canvas, x0: float, y0: float, x1: float, y1: float, t_bias: float = 0.5):
+    p = c.beginPath()
+    _add_connector(p, x0, y0, x1, y1, t_bias)
     c.drawPath(p)
 
-def vignette_overlay(c: canvas.Canvas, page_w: float, page_h: float, strength: float = 0.08):
-    # simple vignette using expanding translucent rects
+@lru_cache(maxsize=16)
+def _vignette_image(w_px: int, h_px: int, strength: float) -> ImageReader:
+    """Raster of the 16 stacked translucent rects (1px per pt), composited once."""
     steps = 16
-    for i in range(steps):
-        alpha = strength * (i+1)/steps
-        c.setFillColorRGB(0,0,0, alpha=alpha)
-        inset = 6 * (steps - i)
-        c.rect(0 + inset, 0 + inset, page_w - 2*inset, page_h - 2*inset, fill=1, stroke=0)
+    # composite alpha when the innermost k rects (highest alphas) overlap a point
+    acc = [0.0]
+    keep = 1.0
+    for i in range(steps - 1, -1, -1):
+        keep *= 1.0 - strength * (i+1)/steps
+        acc.append(1.0 - keep)
+    xs = np.arange(w_px) + 0.5
+    ys = np.arange(h_px) + 0.5
+    d = np.minimum(np.minimum(xs, w_px - xs)[None, :], np.minimum(ys, h_px - ys)[:, None])
+    k = np.clip((d // 6).astype(np.intp), 0, steps)
+    alpha = np.asarray(acc)[k]
+    rgba = np.zeros((h_px, w_px, 4), dtype=np.uint8)
+    rgba[..., 3] = np.round(alpha * 255).astype(np.uint8)
+    return ImageReader(Image.fromarray(rgba, "RGBA"))
+
+def vignette_overlay(c: canvas.Canvas, page_w: float, page_h: float, strength: float = 0.08):
+    # vignette of expanding translucent rects, rasterized once per page size/strength
+    img = _vignette_image(int(math.ceil(page_w)), int(math.ceil(page_h)), round(strength, 3))
+    c.drawImage(img, 0, 0, page_w, page_h, mask="auto")
 
 def node_size_for_text(c: canvas.Canvas, text: str, font_name: str, font_size: float, padding=(16,12)) -> tuple[float,float]:
     c.setFont(font_name, font_size)
-    w = c.stringWidth(text, font_name, font_size)
+    w = measure_text(text, font_name, font_size)
     h = font_size * 1.4
     return (w + padding[0]*2, h + padding[1]*2)
 
-def text_wrap(c: canvas.Canvas, text: str, font_name: str, font_size: float, max_width: float) -> list[str]:
-    c.setFont(font_name, font_size)
-    words = text.split()
+def _wrap_words(words: List[str], font_name: str, font_size: float, max_width: float, max_lines: int | None = None) -> list[str]:
+    """Greedy wrap measuring each word once; line width is accumulated, not re-measured.
+
+    With max_lines, stops as soon as that many lines are complete (same as slicing the full wrap).
+    """
+    space_w = measure_text(" ", font_name, font_size)
     lines = []
     cur = []
+    cur_w = 0.0
     for w in words:
-        test = (" ".join(cur+[w])).strip()
-        if c.stringWidth(test, font_name, font_size) <= max_width or not cur:
+        ww = measure_text(w, font_name, font_size)
+        if not cur:
+            cur.append(w)
+            cur_w = ww
+        elif cur_w + space_w + ww <= max_width:
             cur.append(w)
+            cur_w += space_w + ww
         else:
             lines.append(" ".join(cur))
+            if max_lines is not None and len(lines) >= max_lines:
+                return lines
             cur = [w]
-    if cur:
+            cur_w = ww
+    if cur and (max_lines is None or len(lines) < max_lines):
         lines.append(" ".join(cur))
     return lines
 
+@lru_cache(maxsize=2048)
+def _wrap_cached(text: str, font_name: str, font_size: float, max_width: float, max_lines: int | None) -> Tuple[str, ...]:
+    return tuple(_wrap_words(text.split(), font_name, font_size, max_width, max_lines))
+
+def wrap_lines(text: str, font_name: str, font_size: float, max_width: float, max_lines: int | None = None) -> list[str]:
+    """Canvas-free greedy wrap (usable from pure layout passes); memoized per text/font/width."""
+    return list(_wrap_cached(text, font_name, round(font_size, 2), round(max_width, 2), max_lines))
+
+def text_wrap(c: canvas.Canvas, text: str, font_name: str, font_size: float, max_width: float, max_lines: int | None = None) -> list[str]:
+    # pure measurement: callers own the canvas font state
+    return wrap_lines(text, font_name, font_size, max_width, max_lines)
+
 def curved_arrow(c: canvas.Canvas, x0: float, y0: float, x1: float, y1: float, color_hex: str, width: float = 1.2, head: float = 8):
-    c.setStrokeColor(HexColor(color_hex))
+    curved_arrows(c, [(x0, y0, x1, y1)], color_hex, width=width, head=head)
+
+def curved_arrows(c: canvas.Canvas, arrows: List[Tuple[float, float, float, float]], color_hex: str, width: float = 1.2, head: float = 8):
+    """Same-colored arrows as one connector path (stroked) plus one head path (filled)."""
+    if not arrows:
+        return
+    color = HexColor(color_hex)
+    connectors = c.beginPath()
+    heads = c.beginPath()
+    for x0, y0, x1, y1 in arrows:
+        _add_connector(connectors, x0, y0, x1, y1, t_bias=0.5)
+        _add_arrow_head(heads, x0, y0, x1, y1, head)
+    c.setStrokeColor(color)
     c.setLineWidth(width)
-    draw_bezier_connector(c, x0, y0, x1, y1, t_bias=0.5)
-    # tiny arrow head
-    angle = math.atan2(y1-y0, x1-x0)
-    ax = x1 - head*math.cos(angle - 0.4)
-    ay = y1 - head*math.sin(angle - 0.4)
-    bx = x1 - head*math.cos(angle + 0.4)
-    by = y1 - head*math.sin(angle + 0.4)
-    p = c.beginPath()
-    p.moveTo(x1, y1)
-    p.lineTo(ax, ay)
-    p.lineTo(bx, by)
-    p.close()
-    c.setFillColor(HexColor(color_hex))
-    c.drawPath(p, fill=1, stroke=0)
+    c.drawPath(connectors)
+    c.setFillColor(color)
+    c.drawPath(heads, fill=1, stroke=0)
 
 def progress_bar(c: canvas.Canvas, x: float, y: float, w: float, h: float, steps: int, current: int, accent_hex: str, muted_hex: str):
     seg_w = w / steps
-    for i in range(steps):
-        color = accent_hex if i < current else muted_hex
-        c.setFillColor(HexColor(color))
-        c.rect(x + i*seg_w + 1, y, seg_w - 2, h, fill=1, stroke=0)
+    seg_xs = [x + i*seg_w + 1 for i in range(steps)]
+    done = max(0, min(current, steps))
+    # completed segments first, then the rest: at most two fill changes
+    for color_hex, xs in ((accent_hex, seg_xs[:done]), (muted_hex, seg_xs[done:])):
+        if not xs:
+            continue
+        c.setFillColor(HexColor(color_hex))
+        for sx in xs:
+            c.rect(sx, y, seg_w - 2, h, fill=1, stroke=0)
 
 # ---- layout helpers (NEW) ----
 
@@ -154,22 +243,27 @@ def content_frame(page_w: float, page_h: float, theme: dict) -> tuple[float,floa
     h = page_h - max(L["safe_top"], M["top"]) - y
     return (x, y, w, h)
 
-def clamp_title(c: canvas.Canvas, text: str, font_name: str, start_size: float, min_size: float, max_width: float) -> tuple[float, list[str]]:
-    """Return (size, lines<=2) that fit in max_width by shrinking or wrapping."""
+@lru_cache(maxsize=1024)
+def _clamp_cached(text: str, font_name: str, start_size: float, min_size: float, max_width: float) -> Tuple[float, Tuple[str, ...]]:
     size = start_size
     # try keep one line by shrinking
-    if c.stringWidth(text, font_name, size) <= max_width:
-        return size, [text]
+    if measure_text(text, font_name, size) <= max_width:
+        return size, (text,)
     # try shrink to min
-    while size > min_size and c.stringWidth(text, font_name, size) > max_width:
+    while size > min_size and measure_text(text, font_name, size) > max_width:
         size -= 1
-    if c.stringWidth(text, font_name, size) <= max_width:
-        return size, [text]
+    if measure_text(text, font_name, size) <= max_width:
+        return size, (text,)
     # wrap to 2 lines
-    lines = text_wrap(c, text, font_name, size, max_width)
+    lines = wrap_lines(text, font_name, size, max_width)
     if len(lines) > 2:
         lines = [" ".join(lines[:-1]), lines[-1]]
-    return size, lines
+    return size, tuple(lines)
+
+def clamp_title(c: canvas.Canvas, text: str, font_name: str, start_size: float, min_size: float, max_width: float) -> tuple[float, list[str]]:
+    """Return (size, lines<=2) that fit in max_width by shrinking or wrapping; memoized per text/font/width."""
+    size, lines = _clamp_cached(text, font_name, start_size, min_size, round(max_width, 1))
+    return size, list(lines)
 
 def measure_lines_height(font_size: float, line_count: int, leading_multiplier: float) -> float:
     return font_size * leading_multiplier * line_count
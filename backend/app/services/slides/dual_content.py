@@ -22,7 +22,9 @@ except Exception:
         return re.sub(r"\s+", " ", re.sub(r"[^\w\s]", "", (s or "").lower())).strip()
 
     def _is_near_dup(a: str, b: str, thresh: float = 0.9) -> bool:
-        return SequenceMatcher(None, _norm(a), _norm(b)).ratio() >= thresh
+        # difflib's cheap upper bounds first; ratio() only for pairs that could pass
+        m = SequenceMatcher(None, _norm(a), _norm(b))
+        return m.real_quick_ratio() >= thresh and m.quick_ratio() >= thresh and m.ratio() >= thresh
 
     def deduplicate_content(
         narrative: str | list[str],
@@ -65,6 +67,13 @@ except Exception:
         return narrative_text, kc, sd
 
 
+_DETAIL_LEVELS = {
+    "basic": "brief, foundational overview",
+    "detailed": "thorough explanation with practical examples",
+    "comprehensive": "in-depth analysis with theory and practice",
+}
+
+
 class DualContentGenerator:
     """Generates both concise and expanded content for slides."""
 
@@ -72,21 +81,16 @@ class DualContentGenerator:
         """
         Args:
             model: Gemini model instance (google.generativeai.GenerativeModel)
-            level: "basic" | "detailed" | "comprehensive"
+            level: "basic" | "detailed" | "comprehensive" (unknown -> "detailed")
         """
         self.model = model
-        self.level = level
+        self.level = level if level in _DETAIL_LEVELS else "detailed"
 
     # -----------------------------------------------------------------
     # Prompt build
     # -----------------------------------------------------------------
     def _build_dual_content_prompt(self, topic: str, title: str, points: List[str]) -> str:
-        detail_levels = {
-            "basic": "brief, foundational overview",
-            "detailed": "thorough explanation with practical examples",
-            "comprehensive": "in-depth analysis with theory and practice",
-        }
-        detail_desc = detail_levels.get(self.level, detail_levels["detailed"])
+        detail_desc = _DETAIL_LEVELS[self.level]
 
         bullets = "\n".join(f"- {p}" for p in (points or []))
 
@@ -176,6 +180,20 @@ Return ONLY a valid JSON object matching this structure (no extra prose):
                 pass
         raise ValueError("Model did not return valid JSON.")
 
+    @staticmethod
+    def _fallback(topic: str, title: str, points: List[str]) -> Dict[str, Any]:
+        """Compress points into a narrative and produce short extras (no model call)."""
+        pts = [p for p in (points or []) if p]
+        fallback_narr = " ".join(pts)[:800] if pts else f"{title} — {topic}"
+        return {
+            "expanded_content": fallback_narr,
+            "key_concepts": pts[:3],
+            "supporting_details": (
+                [f"Example/analogy for: {pts[0]}", f"Pitfall related to: {pts[-1]}"]
+                if len(pts) >= 2 else []
+            ),
+        }
+
     # -----------------------------------------------------------------
     # Public API
     # -----------------------------------------------------------------
@@ -194,6 +212,11 @@ Return ONLY a valid JSON object matching this structure (no extra prose):
               "supporting_details": List[str]
             }
         """
+        # Fail fast: nothing meaningful to ask the model about
+        if not (topic and title):
+            logger.warning("Skipping model call for '%s': missing topic/title", title)
+            return self._fallback(topic, title, points)
+
         generation_config = {
             "temperature": 0.4,
             "max_output_tokens": 2048,
@@ -249,14 +272,4 @@ Return ONLY a valid JSON object matching this structure (no extra prose):
 
         except Exception as e:
             logger.error("Failed to generate content for '%s': %s", title, e)
-            # Fallback: compress points into narrative and produce short extras
-            pts = [p for p in (points or []) if p]
-            fallback_narr = " ".join(pts)[:800] if pts else f"{title} — {topic}"
-            return {
-                "expanded_content": fallback_narr,
-                "key_concepts": pts[:3],
-                "supporting_details": (
-                    [f"Example/analogy for: {pts[0]}", f"Pitfall related to: {pts[-1]}"]
-                    if len(pts) >= 2 else []
-                ),
-            }
+            return self._fallback(topic, title, points)
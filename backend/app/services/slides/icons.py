@@ -1,27 +1,43 @@
 from __future__ import annotations
 
+from dataclasses import dataclass, field
+from types import MappingProxyType
+from typing import Final, Mapping
+
 # Keep your existing rotations; add a semantic helper fallback-safe.
 
-POINT_SPACING_PT = 12
+POINT_SPACING_PT: Final[int] = 12
+
+
+@dataclass(frozen=True, slots=True)
+class IconTheme:
+    bullets: tuple[str, ...]
+    n: int = field(init=False)
+
+    def __post_init__(self) -> None:
+        object.__setattr__(self, "n", len(self.bullets))
+
+
+THEMES: Final[Mapping[str, IconTheme]] = MappingProxyType({
+    "minimalist": IconTheme(("•", "◦", "▹")),
+    "chalkboard": IconTheme(("✦", "✧", "—")),
+    "corporate":  IconTheme(("■", "▪", "▸")),
+})
 
-THEME_BULLETS = {
-    "minimalist": ["•", "◦", "▹"],
-    "chalkboard": ["✦", "✧", "—"],
-    "corporate":  ["■", "▪", "▸"],
-}
+_DEFAULT_THEME: Final[IconTheme] = THEMES["minimalist"]
 
-SEMANTIC = [
+SEMANTIC: Final[tuple[tuple[tuple[str, ...], str], ...]] = (
     (("time","timeline","duration"), "⏱"),
     (("compare","vs","contrast"), "⚖️"),
     (("process","step","workflow"), "🔁"),
     (("tip","note","important","key"), "💡"),
     (("tree","hierarchy","parent","child"), "🌳"),
     (("data","memory","state"), "🧠"),
-]
+)
 
 def get_point_icon(theme_key: str, index: int) -> str:
-    seq = THEME_BULLETS.get(theme_key, THEME_BULLETS["minimalist"])
-    return seq[index % len(seq)]
+    t = THEMES.get(theme_key, _DEFAULT_THEME)
+    return t.bullets[index % t.n]
 
 def get_semantic_icon(text: str, theme_key: str) -> str:
     low = (text or "").lower()
@@ -1,11 +1,12 @@
 from __future__ import annotations
 
-import math
 import random
-import copy
+from dataclasses import dataclass
+from functools import lru_cache
 from io import BytesIO
-from typing import List, Tuple
+from typing import BinaryIO, List, NamedTuple, Tuple
 
+import numpy as np
 from reportlab.pdfgen import canvas
 from reportlab.lib.pagesizes import A4, A5, landscape, portrait
 from reportlab.lib.colors import HexColor, white
@@ -13,22 +14,27 @@ from reportlab.lib.colors import HexColor, white
 from app.schemas.slides import LecturePlan, SlideItem
 from .icons import get_semantic_icon, POINT_SPACING_PT
 from .diagram_draw import (
-    polar_to_xy,
-    layout_radial,
-    draw_bezier_connector,
     lighten,
-    darken,
     vignette_overlay,
-    text_wrap,
-    node_size_for_text,
+    wrap_lines,
     rounded_rect,
-    curved_arrow,
+    curved_arrows,
     progress_bar,
     content_frame as compute_frame,
     clamp_title,
     measure_lines_height,
+    measure_text,
 )
 
+# Shared per-item geometry (identical for every box / bullet)
+_FLOW_MAX_STEPS = 6
+_FLOW_LABEL_CHARS = 40
+_FLOW_FONT_SIZE = 13
+_FLOW_TEXT_INSET = 14
+_FLOW_LINE_STEP = 16
+_FLOW_MAX_LINES = 3
+_NOTES_MAX_LINES = 4
+
 # -------------------------------------------------------------------
 # PUBLIC
 # -------------------------------------------------------------------
@@ -40,13 +46,67 @@ def build_pdf(
     notes_only: bool = False,
     no_ornaments: bool = False,
     no_dropcaps: bool = False,
+    draft: bool = False,
+    compress: bool = True,
 ) -> bytes:
-    """Builds: Title Splash (pg1), Flowchart (pg2), Notes (rest) with adaptive layout."""
+    """Builds: Title Splash (pg1), Flowchart (pg2), Notes (rest) with adaptive layout.
+
+    draft=True renders a fast preview: solid backgrounds and unexpanded bullet points.
+    compress=False writes uncompressed page streams (cheaper CPU, larger file).
+    """
+    return build_pdf_stream(
+        plan,
+        theme,
+        cheatsheet_only=cheatsheet_only,
+        notes_only=notes_only,
+        no_ornaments=no_ornaments,
+        no_dropcaps=no_dropcaps,
+        draft=draft,
+        compress=compress,
+    ).getvalue()
+
+def build_pdf_stream(
+    plan: LecturePlan,
+    theme: dict,
+    cheatsheet_only: bool = False,
+    notes_only: bool = False,
+    no_ornaments: bool = False,
+    no_dropcaps: bool = False,
+    draft: bool = False,
+    compress: bool = True,
+) -> BytesIO:
+    """Same document as build_pdf as an in-memory stream rewound to 0 (for StreamingResponse/upload_fileobj)."""
     buf = BytesIO()
-    
+    build_pdf_to(
+        plan,
+        theme,
+        buf,
+        cheatsheet_only=cheatsheet_only,
+        notes_only=notes_only,
+        no_ornaments=no_ornaments,
+        no_dropcaps=no_dropcaps,
+        draft=draft,
+        compress=compress,
+    )
+    buf.seek(0)
+    return buf
+
+def build_pdf_to(
+    plan: LecturePlan,
+    theme: dict,
+    out: BinaryIO,
+    cheatsheet_only: bool = False,
+    notes_only: bool = False,
+    no_ornaments: bool = False,
+    no_dropcaps: bool = False,
+    draft: bool = False,
+    compress: bool = True,
+) -> None:
+    """Same document as build_pdf, written straight into a caller-owned binary stream."""
     # Determine page size based on device_preset or orientation
     page_w, page_h = _determine_page_size(plan)
-    c = canvas.Canvas(buf, pagesize=(page_w, page_h))
+    # explicit, so output size does not depend on the site's rl_config defaults
+    c = canvas.Canvas(out, pagesize=(page_w, page_h), pageCompression=1 if compress else 0)
     
     # Compute content frame and adaptive scaling
     cf_x, cf_y, cf_w, cf_h = compute_frame(page_w, page_h, theme)
@@ -54,6 +114,17 @@ def build_pdf(
     
     # Create scaled theme (local copy, don't mutate original)
     theme_local = _apply_scale_to_theme(theme, scale)
+    theme_local["_rects"] = _precompute_layout(theme_local, page_w, page_h)
+    if draft:
+        # previews skip the vignette raster entirely
+        theme_local["vignette"] = {"strength": 0.0}
+
+    # every page shares one background: record it once as a form XObject and replay it
+    bg_form = f"bg_{int(page_w)}_{int(page_h)}"
+    c.beginForm(bg_form)
+    draw_page_background(c, page_w, page_h, theme_local, ornaments=not no_ornaments)
+    c.endForm()
+    theme_local["_bg_form"] = bg_form
     
     # Simple page count like the original working version
     total_pages = (2 if not notes_only else 0) + (0 if cheatsheet_only else len(plan.slides))
@@ -68,8 +139,12 @@ def build_pdf(
         c.showPage()
 
     if not cheatsheet_only:
+        # bullets that cannot fit on a notes page are never expanded or wrapped
+        capacity = _bullet_capacity(_notes_body_origin(plan, theme_local, page_w, page_h)[1], theme_local)
+        expanded = _pre_expand_plan(plan, draft=draft, limit=capacity)
+        bullets = _layout_notes_pages(plan, expanded, theme_local, page_w, page_h)
         for i, slide in enumerate(plan.slides, start=1):
-            draw_notes_page(c, slide, i, len(plan.slides), plan, theme_local, page_w, page_h)
+            draw_notes_page(c, slide, i, len(plan.slides), plan, theme_local, page_w, page_h, draft=draft, bullets=bullets[i - 1])
             draw_footer(
                 c,
                 plan,
@@ -82,8 +157,6 @@ def build_pdf(
             c.showPage()
 
     c.save()
-    buf.seek(0)
-    return buf.read()
 
 # -------------------------------------------------------------------
 # ADAPTIVE SIZING HELPERS
@@ -91,16 +164,20 @@ def build_pdf(
 
 def _determine_page_size(plan: LecturePlan) -> Tuple[float, float]:
     """Determine page size based on device_preset or orientation."""
+    return _page_size_for(plan.device_preset, plan.orientation)
+
+@lru_cache(maxsize=16)
+def _page_size_for(device_preset: str | None, orientation: str | None) -> Tuple[float, float]:
     # Device preset takes priority
-    if plan.device_preset == "desktop":
+    if device_preset == "desktop":
         return landscape(A4)
-    elif plan.device_preset == "tablet":
+    elif device_preset == "tablet":
         return portrait(A4)
-    elif plan.device_preset == "mobile":
+    elif device_preset == "mobile":
         return portrait(A5)
     
     # Fall back to orientation
-    orientation_mode = plan.orientation or "auto"
+    orientation_mode = orientation or "auto"
     
     if orientation_mode == "portrait":
         return portrait(A4)
@@ -122,36 +199,129 @@ def _compute_scale(cf_w: float) -> float:
 
 def _apply_scale_to_theme(theme: dict, scale: float) -> dict:
     """Create a scaled copy of theme with adjusted sizes."""
-    theme_local = copy.deepcopy(theme)
-    sizes = theme_local["sizes"]
-    
+    # only sizes is written to, so a shallow copy plus a fresh sizes dict suffices;
+    # the scaled sizes and parsed colors are memoized by value across builds
+    return {
+        **theme,
+        "sizes": dict(_scaled_sizes(tuple(theme["sizes"].items()), scale)),
+        # parse colors once here so no draw call re-parses hex strings
+        "_colors": _colors_for(tuple(theme["colors"].items())),
+    }
+
+@lru_cache(maxsize=32)
+def _scaled_sizes(sizes: Tuple[Tuple[str, float], ...], scale: float) -> Tuple[Tuple[str, float], ...]:
+    scaled = dict(sizes)
     # Scale typography
-    sizes["display"] = max(18, int(sizes["display"] * scale))
-    sizes["title"] = max(18, int(sizes["title"] * scale))
-    sizes["h2"] = max(18, int(sizes["h2"] * scale))
-    sizes["h3"] = max(14, int(sizes["h3"] * scale))
-    sizes["body"] = max(11, int(sizes["body"] * scale))
-    sizes["footer"] = max(9, int(sizes["footer"] * scale))
-    
-    return theme_local
+    scaled["display"] = max(18, int(scaled["display"] * scale))
+    scaled["title"] = max(18, int(scaled["title"] * scale))
+    scaled["h2"] = max(18, int(scaled["h2"] * scale))
+    scaled["h3"] = max(14, int(scaled["h3"] * scale))
+    scaled["body"] = max(11, int(scaled["body"] * scale))
+    scaled["footer"] = max(9, int(scaled["footer"] * scale))
+    return tuple(scaled.items())
+
+@lru_cache(maxsize=32)
+def _colors_for(colors: Tuple[Tuple[str, str], ...]) -> _ThemeColors:
+    return _resolve_colors({"colors": dict(colors)})
+
+@dataclass(frozen=True, slots=True)
+class _ThemeColors:
+    bg: HexColor
+    text: HexColor
+    muted: HexColor
+    accent: HexColor
+    accent2: HexColor
+    accent_light: HexColor   # lighten(accent, 0.35): even chalkboard boxes
+    accent_soft: HexColor    # lighten(accent, 0.2): odd chalkboard boxes
+
+def _resolve_colors(theme: dict) -> _ThemeColors:
+    """Parse the theme colors (and derived tints) into HexColor once per build."""
+    colors = theme["colors"]
+    return _ThemeColors(
+        bg=HexColor(colors["bg"]),
+        text=HexColor(colors["text"]),
+        muted=HexColor(colors["muted"]),
+        accent=HexColor(colors["accent"]),
+        accent2=HexColor(colors["accent2"]),
+        accent_light=HexColor(lighten(colors["accent"], 0.35)),
+        accent_soft=HexColor(lighten(colors["accent"], 0.2)),
+    )
+
+def _theme_colors(theme: dict) -> _ThemeColors:
+    """Pre-parsed colors attached by build_pdf; resolved on demand for direct callers."""
+    resolved = theme.get("_colors")
+    return resolved if resolved is not None else _resolve_colors(theme)
+
+@dataclass(frozen=True, slots=True)
+class _LayoutRects:
+    page_w: float
+    page_h: float
+    left: float       # safe left edge (max of safe area and margin)
+    right: float      # safe right edge
+    bottom: float     # footer baseline
+    band_top: float   # top of the title band
+    cf_x: float
+    cf_y: float
+    cf_w: float
+    cf_h: float
+
+def _precompute_layout(theme: dict, page_w: float, page_h: float) -> _LayoutRects:
+    """Resolve the page-size-dependent edges and content frame once per build."""
+    layout = theme["layout"]; margins = theme["margins"]
+    cf_x, cf_y, cf_w, cf_h = compute_frame(page_w, page_h, theme)
+    return _LayoutRects(
+        page_w=page_w,
+        page_h=page_h,
+        left=max(layout["safe_left"], margins["left"]),
+        right=page_w - max(layout["safe_right"], margins["right"]),
+        bottom=layout["safe_bottom"],
+        band_top=page_h - layout["safe_top"]/2,
+        cf_x=cf_x, cf_y=cf_y, cf_w=cf_w, cf_h=cf_h,
+    )
+
+def _layout_rects(theme: dict, page_w: float, page_h: float) -> _LayoutRects:
+    """Rects attached by build_pdf; recomputed for direct callers or a different page size."""
+    rects = theme.get("_rects")
+    if rects is not None and rects.page_w == page_w and rects.page_h == page_h:
+        return rects
+    return _precompute_layout(theme, page_w, page_h)
 
 # -------------------------------------------------------------------
 # BACKGROUND + SAFE AREA
 # -------------------------------------------------------------------
 
-def draw_page_background(c: canvas.Canvas, page_w: float, page_h: float, theme: dict) -> None:
-    bg_hex = theme["colors"]["bg"]
-    c.setFillColor(HexColor(bg_hex))
+def draw_page_background(c: canvas.Canvas, page_w: float, page_h: float, theme: dict, ornaments: bool = True) -> None:
+    form = theme.get("_bg_form")
+    if form:
+        c.doForm(form)
+        return
+    c.setFillColor(_theme_colors(theme).bg)
     c.rect(0, 0, page_w, page_h, fill=1, stroke=0)
-    vignette_overlay(c, page_w, page_h, strength=theme.get("vignette", {}).get("strength", 0.06))
+    if not ornaments:
+        return
+    strength = theme.get("vignette", {}).get("strength", 0.06)
+    # imperceptible vignettes are not worth a raster
+    if strength > 0.001:
+        vignette_overlay(c, page_w, page_h, strength=strength)
 
 def get_content_frame(page_w: float, page_h: float, theme: dict) -> tuple[float,float,float,float]:
-    return compute_frame(page_w, page_h, theme)
+    r = _layout_rects(theme, page_w, page_h)
+    return (r.cf_x, r.cf_y, r.cf_w, r.cf_h)
 
 # -------------------------------------------------------------------
 # HEADER/FOOTER + TITLES
 # -------------------------------------------------------------------
 
+def _draw_text_block(c: canvas.Canvas, placed) -> None:
+    """Emit (x, y, text) runs in the canvas's current font/fill as one BT/ET text object."""
+    if not placed:
+        return
+    t = c.beginText()
+    for x, y, line in placed:
+        t.setTextOrigin(x, y)
+        t.textOut(line)
+    c.drawText(t)
+
 def draw_title_in_band(
     c: canvas.Canvas,
     text: str,
@@ -163,8 +333,13 @@ def draw_title_in_band(
 ) -> float:
     """Render title inside a horizontal band; returns baseline y used for subsequent content."""
     fonts = theme["fonts"]; sizes = theme["sizes"]; layout = theme["layout"]; colors = theme["colors"]
-    left = max(theme["layout"]["safe_left"], theme["margins"]["left"])
-    right = page_w - max(theme["layout"]["safe_right"], theme["margins"]["right"])
+    # band title ignores page height; reuse the attached rects when the width matches
+    rects = theme.get("_rects")
+    if rects is not None and rects.page_w == page_w:
+        left, right = rects.left, rects.right
+    else:
+        left = max(layout["safe_left"], theme["margins"]["left"])
+        right = page_w - max(layout["safe_right"], theme["margins"]["right"])
     max_width = right - left
 
     size, lines = clamp_title(c, text, fonts["title"], sizes["title"], layout["title_min_size"], max_width)
@@ -175,17 +350,19 @@ def draw_title_in_band(
     y_center = band_top - band_height/2
     start_y = y_center + (total_h/2) - size
 
-    c.setFillColor(HexColor(colors["text"]))
+    c.setFillColor(_theme_colors(theme).text)
     c.setFont(fonts["title"], size)
 
+    placed = []
     for i, line in enumerate(lines):
-        tw = c.stringWidth(line, fonts["title"], size)
+        tw = measure_text(line, fonts["title"], size)
         if align == "center":
             x = (left + right)/2 - tw/2
         else:
             x = left
         y = start_y - i * leading
-        c.drawString(x, y, line)
+        placed.append((x, y, line))
+    _draw_text_block(c, placed)
 
     return band_top - band_height
 
@@ -199,26 +376,27 @@ def draw_footer(
     page_h: float,
 ):
     colors = theme["colors"]; sizes = theme["sizes"]; layout = theme["layout"]
-    left = max(layout["safe_left"], theme["margins"]["left"])
-    right = page_w - max(layout["safe_right"], theme["margins"]["right"])
-    bottom = layout["safe_bottom"]
+    rects = _layout_rects(theme, page_w, page_h)
+    left, right, bottom = rects.left, rects.right, rects.bottom
+
+    muted = _theme_colors(theme).muted
 
     # divider
-    c.setStrokeColor(HexColor(colors["muted"]))
+    c.setStrokeColor(muted)
     c.setLineWidth(0.8)
     c.line(left, bottom + 10, right, bottom + 10)
 
     # folio text
     c.setFont(theme["fonts"]["body"], sizes["footer"])
-    c.setFillColor(HexColor(colors["muted"]))
+    c.setFillColor(muted)
     folio = f"{plan.topic} • {page_index}/{total_pages}"
-    tw = c.stringWidth(folio, theme["fonts"]["body"], sizes["footer"])
+    tw = measure_text(folio, theme["fonts"]["body"], sizes["footer"])
     
     theme_key = plan.theme.lower()
     if theme_key == "minimalist":
         x = (page_w - tw)/2
     elif theme_key == "chalkboard":
-        x = max(layout["safe_left"], theme["margins"]["left"])
+        x = left
     else:
         x = right - tw
     c.drawString(x, bottom, folio)
@@ -247,26 +425,61 @@ def draw_title_splash(c: canvas.Canvas, plan: LecturePlan, theme: dict, page_w:
     start_y = center_y + (total_h / 2.0) - size
 
     c.setFont(fonts["title"], size)
-    c.setFillColor(HexColor(colors["text"]))
+    c.setFillColor(_theme_colors(theme).text)
 
+    placed = []
     for i, line in enumerate(lines):
-        tw = c.stringWidth(line, fonts["title"], size)
+        tw = measure_text(line, fonts["title"], size)
         x = cf_x + (cf_w - tw) / 2.0
         y = start_y - i * leading
-        c.drawString(x, y, line)
+        placed.append((x, y, line))
+    _draw_text_block(c, placed)
 
 # -------------------------------------------------------------------
 # PAGE 2: FLOWCHART (RESPONSIVE GRID)
 # -------------------------------------------------------------------
 
+# per-theme box bodies: fill + outline (+ stripe), theme constants baked in
+
+def _draw_box_minimalist(c: canvas.Canvas, x: float, y: float, w: float, h: float, fill, accent) -> None:
+    c.setFillColor(fill)
+    c.setStrokeColor(accent)
+    rounded_rect(c, x, y, w, h, 24, fill=True, stroke=True)
+
+def _draw_box_chalkboard(c: canvas.Canvas, x: float, y: float, w: float, h: float, fill, accent) -> None:
+    c.setFillColor(fill)
+    c.setStrokeColor(accent)
+    rounded_rect(c, x, y, w, h, 8, fill=True, stroke=True)
+
+def _draw_box_corporate(c: canvas.Canvas, x: float, y: float, w: float, h: float, fill, accent) -> None:
+    # the header stripe sits between body and outline, so this theme keeps two passes
+    c.setFillColor(fill)
+    rounded_rect(c, x, y, w, h, 6, fill=True, stroke=False)
+    c.setFillColor(accent)
+    c.rect(x, y + h - 10, w, 10, fill=1, stroke=0)
+    c.setStrokeColor(accent)
+    rounded_rect(c, x, y, w, h, 6, fill=False, stroke=True)
+
+def _draw_box_default(c: canvas.Canvas, x: float, y: float, w: float, h: float, fill, accent) -> None:
+    c.setFillColor(fill)
+    c.setStrokeColor(accent)
+    rounded_rect(c, x, y, w, h, 6, fill=True, stroke=True)
+
+_BOX_RENDERERS = {
+    "minimalist": _draw_box_minimalist,
+    "chalkboard": _draw_box_chalkboard,
+    "corporate": _draw_box_corporate,
+}
+
 def draw_flowchart(c: canvas.Canvas, plan: LecturePlan, theme: dict, page_w: float, page_h: float):
     draw_page_background(c, page_w, page_h, theme)
     colors = theme["colors"]; sizes = theme["sizes"]; layout = theme["layout"]
+    hex_colors = _theme_colors(theme)
     cf_x, cf_y, cf_w, cf_h = get_content_frame(page_w, page_h, theme)
 
     # header band
     band_h = 56
-    band_top = page_h - layout["safe_top"]/2
+    band_top = _layout_rects(theme, page_w, page_h).band_top
     draw_title_in_band(c, "Process Flow", band_top, band_h, theme, page_w, align="left")
 
     # pick slide
@@ -278,7 +491,7 @@ def draw_flowchart(c: canvas.Canvas, plan: LecturePlan, theme: dict, page_w: flo
         proc = plan.slides[0]
     if not proc: return
 
-    steps = proc.points[:6]
+    steps = proc.points[:_FLOW_MAX_STEPS]
     if not steps: return
 
     # Responsive grid layout
@@ -286,8 +499,8 @@ def draw_flowchart(c: canvas.Canvas, plan: LecturePlan, theme: dict, page_w: flo
     gap_x = 28
     gap_y = 34
     target_box_w = max(160, min(220, cf_w/3 - gap_x))
-    cols = max(1, min(3, int((cf_w + gap_x) / (target_box_w + gap_x))))
-    rows = math.ceil(len(steps) / cols)
+    cols = max(1, min(3, int((cf_w + gap_x) // (target_box_w + gap_x))))
+    rows = -(-len(steps) // cols)  # integer ceil
     median_w = target_box_w
     box_h = 104 if theme_key == "chalkboard" else 96
 
@@ -299,68 +512,64 @@ def draw_flowchart(c: canvas.Canvas, plan: LecturePlan, theme: dict, page_w: flo
     start_x = cf_x + (cf_w - total_grid_w) / 2
     start_y = cf_y + (cf_h - total_grid_h) / 2 + total_grid_h - box_h
 
-    for i, text in enumerate(steps):
-        row = i // cols
-        col = i % cols
-        
-        bx = start_x + col * (median_w + gap_x)
-        by = start_y - row * (box_h + gap_y)
-
-        # Ensure box inside frame
-        bx = max(bx, cf_x)
-        if bx + median_w > cf_x + cf_w:
-            bx = cf_x + cf_w - median_w
-
-        # body
-        c.setFillColor(white if theme_key != "chalkboard" else HexColor(lighten(colors["accent"], 0.35 if i%2==0 else 0.2)))
-        rounded_rect(c, bx, by, median_w, box_h, 24 if theme_key=="minimalist" else 8 if theme_key=="chalkboard" else 6, fill=True, stroke=False)
-        
-        # stripe/stroke
-        accent = colors["accent"] if i % 2 == 0 else colors["accent2"]
-        if theme_key == "corporate":
-            c.setFillColor(HexColor(accent))
-            c.rect(bx, by + box_h - 10, median_w, 10, fill=1, stroke=0)
-        c.setStrokeColor(HexColor(accent))
-        c.setLineWidth(2.0 if theme_key != "chalkboard" else 3.0)
-        rounded_rect(c, bx, by, median_w, box_h, 24 if theme_key=="minimalist" else 8 if theme_key=="chalkboard" else 6, fill=False, stroke=True)
+    # all box origins in one vectorized pass, clamped inside the frame
+    grid_rows, grid_cols = np.divmod(np.arange(len(steps)), cols)
+    grid_xs = start_x + grid_cols * (median_w + gap_x)
+    box_xs = np.clip(grid_xs, cf_x, cf_x + cf_w - median_w).tolist()
+    box_ys = (start_y - grid_rows * (box_h + gap_y)).tolist()
+    # down connectors aim at the (unclamped) top-centre of the following box
+    next_cx = (grid_xs[1:] + median_w / 2).tolist()
+    next_top = [y + box_h for y in box_ys[1:]]
+
+    # loop invariants (per theme); even/odd boxes alternate via index & 1
+    body_font = theme["fonts"]["body"]
+    stroke_w = 3.0 if theme_key == "chalkboard" else 2.0
+    arrow_w = 2.2 if theme_key == "chalkboard" else 1.6
+    render_box = _BOX_RENDERERS.get(theme_key, _draw_box_default)
+    box_fills = (hex_colors.accent_light, hex_colors.accent_soft) if theme_key == "chalkboard" else (white, white)
+    box_accents = (hex_colors.accent, hex_colors.accent2)
+    arrow_hexes = (colors["accent2"], colors["accent"])
+    label_color = hex_colors.bg if theme_key == "chalkboard" else hex_colors.text
+    last = len(steps) - 1
+
+    # connector endpoints for every box but the last, precomputed in one pass:
+    # right within a row, down (to the next row's first box) at a row end.
+    # they are drawn as two paths per color after the boxes.
+    arrows = {colors["accent"]: [], colors["accent2"]: []}
+    for i, (bx, by, col) in enumerate(zip(box_xs, box_ys, grid_cols[:last].tolist())):
+        if col < cols - 1:
+            y_center = by + box_h/2
+            seg = (bx + median_w, y_center, bx + median_w + gap_x, y_center)
+        else:
+            seg = (bx + median_w/2, by, next_cx[i], next_top[i])
+        arrows[arrow_hexes[i & 1]].append(seg)
+
+    # truncate + wrap every label once, up front
+    label_lines = [
+        wrap_lines(
+            text if len(text) <= _FLOW_LABEL_CHARS else text[:_FLOW_LABEL_CHARS] + "...",
+            body_font, _FLOW_FONT_SIZE, median_w - 2*_FLOW_TEXT_INSET, max_lines=_FLOW_MAX_LINES,
+        )
+        for text in steps
+    ]
+
+    # every box label uses the same face and every outline the same width; set them once
+    c.setFont(body_font, _FLOW_FONT_SIZE)
+    c.setLineWidth(stroke_w)
+
+    for i, (lines, bx, by) in enumerate(zip(label_lines, box_xs, box_ys)):
+        parity = i & 1
+        render_box(c, bx, by, median_w, box_h, box_fills[parity], box_accents[parity])
 
         # label text
-        label = text if len(text) <= 40 else text[:40] + "..."
-        c.setFont(theme["fonts"]["body"], 13)
-        c.setFillColor(HexColor(colors["text"] if theme_key != "chalkboard" else colors["bg"]))
-        lines = text_wrap(c, label, theme["fonts"]["body"], 13, median_w - 28)
+        c.setFillColor(label_color)
         ty = by + box_h/2 + 6
-        for ln in lines[:3]:
-            c.drawString(bx + 14, ty, ln)
-            ty -= 16
-
-        # arrows
-        y_center = by + box_h/2
-        
-        # Right arrow (if not last in row and not last item)
-        if col < cols - 1 and i < len(steps) - 1:
-            x0 = bx + median_w
-            x1 = x0 + gap_x
-            curved_arrow(c, x0, y_center, x1, y_center, 
-                        color_hex=colors["accent2"] if i%2==0 else colors["accent"], 
-                        width=1.6 if theme_key != "chalkboard" else 2.2, head=9)
-        
-        # Down arrow (if last in row and not last item overall)
-        elif col == cols - 1 and i < len(steps) - 1:
-            next_row = (i + 1) // cols
-            next_col = (i + 1) % cols
-            next_bx = start_x + next_col * (median_w + gap_x)
-            next_by = start_y - next_row * (box_h + gap_y)
-            
-            # Draw downward connector
-            x_start = bx + median_w / 2
-            y_start = by
-            x_end = next_bx + median_w / 2
-            y_end = next_by + box_h
-            
-            curved_arrow(c, x_start, y_start, x_end, y_end,
-                        color_hex=colors["accent2"] if i%2==0 else colors["accent"],
-                        width=1.6 if theme_key != "chalkboard" else 2.2, head=9)
+        for ln in lines:
+            c.drawString(bx + _FLOW_TEXT_INSET, ty, ln)
+            ty -= _FLOW_LINE_STEP
+
+    for color_hex, batch in arrows.items():
+        curved_arrows(c, batch, color_hex, width=arrow_w, head=9)
 
     # progress bar
     bar_w = min(cf_w*0.8, 560)
@@ -381,64 +590,130 @@ def draw_notes_page(
     theme: dict,
     page_w: float,
     page_h: float,
+    draft: bool = False,
+    points: List[str] | None = None,
+    bullets: _BulletLayout | None = None,
 ):
-    draw_page_background(c, page_w, page_h, theme)
-    colors = theme["colors"]; sizes = theme["sizes"]; layout = theme["layout"]
+    """Notes page for one slide.
 
-    cf_x, cf_y, cf_w, cf_h = get_content_frame(page_w, page_h, theme)
+    `bullets` is a precomputed layout (see _layout_notes_pages); otherwise `points`
+    (pre-expanded bullet texts, expanded here if omitted) are laid out in place.
+    """
+    draw_page_background(c, page_w, page_h, theme)
 
     # header band
-    band_h = 72 if plan.theme=="chalkboard" else 64
-    band_top = page_h - layout["safe_top"]/2
-    title_bottom = draw_title_in_band(c, slide.title, band_top, band_h, theme, page_w, align="left")
-
-    # compute content region (under band, above footer)
-    top_y = min(title_bottom - 10, cf_y + cf_h - 20)
-    x = cf_x
-    max_w = cf_w
-
-    _draw_bulleted_paragraphs(c, x, top_y, max_w, slide.points, theme)
-
-def _draw_bulleted_paragraphs(c: canvas.Canvas, x: float, y_top: float, max_w: float, points: List[str], theme: dict):
-    colors = theme["colors"]; sizes = theme["sizes"]; layout = theme["layout"]
+    band_h = _notes_band_height(plan)
+    band_top = _layout_rects(theme, page_w, page_h).band_top
+    draw_title_in_band(c, slide.title, band_top, band_h, theme, page_w, align="left")
+
+    if bullets is None:
+        x, top_y, max_w = _notes_body_origin(plan, theme, page_w, page_h)
+        if points is None:
+            points = _expand_points(slide.points[:_bullet_capacity(top_y, theme)], draft)
+        bullets = _layout_bulleted_paragraphs(x, top_y, max_w, points, theme)
+    _emit_bulleted_paragraphs(c, bullets, theme)
+
+def _notes_band_height(plan: LecturePlan) -> float:
+    return 72 if plan.theme=="chalkboard" else 64
+
+def _notes_body_origin(plan: LecturePlan, theme: dict, page_w: float, page_h: float) -> Tuple[float, float, float]:
+    """(x, top_y, max_w) of the bullet column; the same on every notes page of a build."""
+    r = _layout_rects(theme, page_w, page_h)
+    # content region sits under the band (draw_title_in_band returns its bottom) and above the footer
+    title_bottom = r.band_top - _notes_band_height(plan)
+    top_y = min(title_bottom - 10, r.cf_y + r.cf_h - 20)
+    return r.cf_x, top_y, r.cf_w
+
+def _layout_notes_pages(plan: LecturePlan, expanded: List[List[str]], theme: dict, page_w: float, page_h: float) -> List[_BulletLayout]:
+    """Bullet layouts for every notes page, parallel to plan.slides."""
+    x, top_y, max_w = _notes_body_origin(plan, theme, page_w, page_h)
+    return [_layout_bulleted_paragraphs(x, top_y, max_w, pts, theme) for pts in expanded]
+
+class _BulletLayout(NamedTuple):
+    markers: List[Tuple[float, float]]     # (x, y) of each bullet marker
+    lines: List[Tuple[float, float, str]]  # (x, y, text) of each body line
+
+def _layout_bulleted_paragraphs(x: float, y_top: float, max_w: float, points: List[str], theme: dict) -> _BulletLayout:
+    """Pure layout pass over already-expanded points: marker and wrapped-line positions, no canvas access."""
+    sizes = theme["sizes"]; layout = theme["layout"]
+    body_font = theme["fonts"]["body"]
     body_fs = sizes["body"]
     leading = body_fs * layout["bullet_leading"]
     para_gap = layout["para_gap_pt"]
     indent = layout["bullet_indent_pt"]
+    wrap_w = max_w - indent - 6
+    # stop before footer band
+    min_y = layout["safe_bottom"] + 36
 
+    markers: List[Tuple[float, float]] = []
+    lines: List[Tuple[float, float, str]] = []
     y = y_top
-    for i, p in enumerate(points):
-        # stop before footer band
-        min_y = layout["safe_bottom"] + 36
+    for p in points[:_bullet_capacity(y_top, theme)]:
         if y < min_y:
             break  # simple stop to avoid overlap
-
-        # icon / marker
-        c.setFillColor(HexColor(colors["accent2"]))
-        if theme is not None and "corporate" in str(theme.get("colors", "")):
-            c.rect(x, y - 3, 6, 6, fill=1, stroke=0)
-        else:
-            c.circle(x + 3, y, 3, fill=1, stroke=0)
-
-        # text
-        c.setFont(theme["fonts"]["body"], body_fs)
-        c.setFillColor(HexColor(colors["text"]))
-        expanded = _expand_point(p)
-        lines = text_wrap(c, expanded, theme["fonts"]["body"], body_fs, max_w - indent - 6)
-        for ln in lines[:4]:
-            c.drawString(x + indent, y, ln)
+        markers.append((x, y))
+        for ln in wrap_lines(p, body_font, body_fs, wrap_w, max_lines=_NOTES_MAX_LINES):
+            lines.append((x + indent, y, ln))
             y -= leading
         y -= para_gap
+    return _BulletLayout(markers, lines)
+
+def _bullet_capacity(y_top: float, theme: dict) -> int:
+    """Upper bound on bullets that can start above the footer (each takes at least one line + gap)."""
+    layout = theme["layout"]
+    min_y = layout["safe_bottom"] + 36
+    if y_top < min_y:
+        return 0
+    step = theme["sizes"]["body"] * layout["bullet_leading"] + layout["para_gap_pt"]
+    return int((y_top - min_y) // step) + 1
+
+def _emit_bulleted_paragraphs(c: canvas.Canvas, rec: _BulletLayout, theme: dict):
+    """Emit pass: all markers under one fill color, then all text under one font + fill."""
+    hex_colors = _theme_colors(theme)
+    # marker shape is a per-theme constant; decide it once, not per bullet
+    square_markers = "corporate" in str(theme.get("colors", ""))
+
+    c.setFillColor(hex_colors.accent2)
+    for mx, my in rec.markers:
+        if square_markers:
+            c.rect(mx, my - 3, 6, 6, fill=1, stroke=0)
+        else:
+            c.circle(mx + 3, my, 3, fill=1, stroke=0)
+
+    c.setFont(theme["fonts"]["body"], theme["sizes"]["body"])
+    c.setFillColor(hex_colors.text)
+    _draw_text_block(c, rec.lines)
 
 # -------------------------------------------------------------------
 # UTIL
 # -------------------------------------------------------------------
 
+# private generator: bullet filler does not touch (or depend on) the global random state
+_RNG = random.Random()
+
+# exactly four entries, so two random bits index the table directly
+_EXPANSION_SUFFIXES = (
+    ". This forms a core building block and should be understood before moving to advanced patterns.",
+    ". Keep practical constraints in mind and be explicit about assumptions while reasoning.",
+    ". Use small traced examples to validate the logic and avoid hidden edge cases.",
+    ". Consider performance trade-offs and memory overhead as inputs scale.",
+)
+
+# points this long already read as full sentences; leave them alone
+_EXPAND_MAX_CHARS = 120
+
 def _expand_point(point: str) -> str:
-    variants = [
-        f"{point}. This forms a core building block and should be understood before moving to advanced patterns.",
-        f"{point}. Keep practical constraints in mind and be explicit about assumptions while reasoning.",
-        f"{point}. Use small traced examples to validate the logic and avoid hidden edge cases.",
-        f"{point}. Consider performance trade-offs and memory overhead as inputs scale.",
-    ]
-    return random.choice(variants)
\ No newline at end of file
+    if len(point) > _EXPAND_MAX_CHARS:
+        return point
+    # pick the suffix first so only the chosen variant is ever built
+    return point + _EXPANSION_SUFFIXES[_RNG.getrandbits(2)]
+
+def _expand_points(points: List[str], draft: bool = False) -> List[str]:
+    # drafts skip the filler sentences
+    if draft:
+        return [p + "." for p in points]
+    return [_expand_point(p) for p in points]
+
+def _pre_expand_plan(plan: LecturePlan, draft: bool = False, limit: int | None = None) -> List[List[str]]:
+    """Expand every slide's bullets (the first `limit` of each) in one pass before rendering; parallel to plan.slides."""
+    return [_expand_points(slide.points[:limit], draft) for slide in plan.slides]
@@ -10,13 +10,14 @@ No imports from pdf_builder.py to avoid cross-module signature/type mismatches.
 
 from __future__ import annotations
 
-from io import BytesIO
-import copy
-from typing import Iterable, List, Tuple
+from dataclasses import dataclass
+from functools import lru_cache
+from typing import BinaryIO, Iterable, List, NamedTuple, Tuple
 
 from reportlab.lib.pagesizes import A4, A5, landscape
 from reportlab.pdfgen import canvas
-from reportlab.lib.colors import HexColor
+from reportlab.lib.colors import Color, HexColor
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
 # --------------------------------------------------------------------------------------
 # Safety + color helpers
@@ -29,6 +30,12 @@ def _assert_theme_dict(theme):
 def _clamp01(v: float) -> float:
     return max(0.0, min(1.0, v))
 
+@lru_cache(maxsize=64)
+def _hc(hex_str: str) -> HexColor:
+    # themes reuse a handful of colors on every page; parse each once
+    return HexColor(hex_str)
+
+@lru_cache(maxsize=256)
 def _hex_to_rgb01(hex_str: str) -> Tuple[float, float, float]:
     h = hex_str.lstrip("#")
     if len(h) == 3:
@@ -38,13 +45,22 @@ def _hex_to_rgb01(hex_str: str) -> Tuple[float, float, float]:
     b = int(h[4:6], 16) / 255.0
     return r, g, b
 
+def _srgb_to_lin(c: float) -> float:
+    return c/12.92 if c <= 0.03928 else ((c+0.055)/1.055) ** 2.4
+
+# hex channels are bytes, so the sRGB -> linear curve is a 256-entry table
+_SRGB_TO_LIN: Tuple[float, ...] = tuple(_srgb_to_lin(v / 255.0) for v in range(256))
+
+@lru_cache(maxsize=256)
 def _luminance(hex_str: str) -> float:
-    r, g, b = _hex_to_rgb01(hex_str)
-    def srgb_to_lin(c):
-        return c/12.92 if c <= 0.03928 else ((c+0.055)/1.055) ** 2.4
-    R, G, B = srgb_to_lin(r), srgb_to_lin(g), srgb_to_lin(b)
-    return 0.2126*R + 0.7152*G + 0.0722*B
+    h = hex_str.lstrip("#")
+    if len(h) == 3:
+        h = "".join(ch*2 for ch in h)
+    n = int(h[:6], 16)
+    lut = _SRGB_TO_LIN
+    return 0.2126*lut[(n >> 16) & 0xFF] + 0.7152*lut[(n >> 8) & 0xFF] + 0.0722*lut[n & 0xFF]
 
+@lru_cache(maxsize=256)
 def _contrast_ratio(fg_hex: str, bg_hex: str) -> float:
     L1 = _luminance(fg_hex)
     L2 = _luminance(bg_hex)
@@ -52,6 +68,7 @@ def _contrast_ratio(fg_hex: str, bg_hex: str) -> float:
         L1, L2 = L2, L1
     return (L1 + 0.05) / (L2 + 0.05)
 
+@lru_cache(maxsize=256)
 def _accessible_text_color(bg_hex: str, light="#FFFFFF", dark="#111111", min_ratio=4.5) -> str:
     # prefer whichever passes; if both pass, pick higher contrast
     cr_light = _contrast_ratio(light, bg_hex)
@@ -71,7 +88,10 @@ def _accessible_text_color(bg_hex: str, light="#FFFFFF", dark="#111111", min_rat
 def _choose_page_size(plan) -> Tuple[float, float]:
     preset = (getattr(plan, "device_preset", None) or "").lower()
     orientation = (getattr(plan, "orientation", None) or "auto").lower()
+    return _page_size_for(preset, orientation)
 
+@lru_cache(maxsize=16)
+def _page_size_for(preset: str, orientation: str) -> Tuple[float, float]:
     if preset == "desktop":
         return landscape(A4)
     if preset == "tablet":
@@ -93,8 +113,9 @@ def _compute_scale(page_w_pts: float, base_w_pts: float = 595.0) -> float:
 
 def _apply_scale_to_theme(theme: dict, scale: float) -> dict:
     _assert_theme_dict(theme)
-    t = copy.deepcopy(theme)
-    sizes = dict(t.get("sizes", {}))
+    # only sizes is rewritten, so a shallow copy plus a fresh sizes dict is enough
+    t = dict(theme)
+    sizes = dict(theme.get("sizes") or {})
 
     for key in ("display", "title", "h2", "h3", "body", "footer"):
         val = sizes.get(key)
@@ -108,6 +129,67 @@ def _apply_scale_to_theme(theme: dict, scale: float) -> dict:
     t["sizes"] = sizes
     return t
 
+@dataclass(frozen=True, slots=True)
+class _RT:
+    """Theme values the page renderers read, resolved once per document."""
+    body_font: str
+    body_size: int
+    hdr_font: str
+    hdr_size: int        # section headers and band titles (h2, falling back to title)
+    footer_size: int
+    bg: Color
+    text: Color          # contrast-safe body text on bg
+    hdr: Color           # section header color (accent)
+    band: Color          # title band fill (accent)
+    band_text: Color     # contrast-safe title text on the band
+    muted: Color         # footer text
+    hdr_advance: float   # drop after a section header
+    para_gap: float      # between overview paragraphs
+    section_gap: float   # after each section
+
+def _resolve_theme(theme: dict) -> _RT:
+    fonts  = theme.get("fonts", {})
+    sizes  = theme.get("sizes", {})
+    colors = theme.get("colors", {})
+    bg_hex = colors.get("bg", "#FFFFFF")
+    band_hex = colors.get("accent", "#222222")
+    body_size = int(sizes.get("body", 12))
+    hdr_size = int(sizes.get("h2", sizes.get("title", 20)))
+    return _RT(
+        body_font=fonts.get("body", "Helvetica"),
+        body_size=body_size,
+        hdr_font=fonts.get("title", "Helvetica-Bold"),
+        hdr_size=hdr_size,
+        footer_size=int(sizes.get("footer", 10)),
+        bg=_hc(bg_hex),
+        text=_hc(_accessible_text_color(bg_hex)),
+        hdr=_hc(colors.get("accent", "#2563EB")),
+        band=_hc(band_hex),
+        band_text=_hc(_accessible_text_color(band_hex)),
+        muted=_hc(colors.get("muted", colors.get("text", "#333333"))),
+        hdr_advance=hdr_size * 1.2,
+        para_gap=max(6.0, body_size * 0.2),
+        section_gap=max(8.0, body_size * 0.3),
+    )
+
+@lru_cache(maxsize=32)
+def _resolved_theme_for(fonts: tuple, sizes: tuple, colors: tuple, scale: float) -> _RT:
+    base = {"fonts": dict(fonts), "sizes": dict(sizes), "colors": dict(colors)}
+    return _resolve_theme(_apply_scale_to_theme(base, scale))
+
+def _get_resolved_theme(theme: dict, scale: float) -> _RT:
+    """_RT for theme at scale, reused across documents rendered with equal fonts/sizes/colors."""
+    try:
+        return _resolved_theme_for(
+            tuple(sorted((theme.get("fonts") or {}).items())),
+            tuple(sorted((theme.get("sizes") or {}).items())),
+            tuple(sorted((theme.get("colors") or {}).items())),
+            scale,
+        )
+    except TypeError:
+        # unhashable token values: resolve without the cache
+        return _resolve_theme(_apply_scale_to_theme(theme, scale))
+
 def _safe_frame(page_w: float, page_h: float, theme: dict) -> Tuple[float, float, float, float]:
     margins = theme.get("margins", {}) or {}
     layout = theme.get("layout", {}) or {}
@@ -123,35 +205,68 @@ def _safe_frame(page_w: float, page_h: float, theme: dict) -> Tuple[float, float
 # Local drawing primitives
 # --------------------------------------------------------------------------------------
 
+@lru_cache(maxsize=32)
+def _width_table(font: str) -> Tuple[float, ...]:
+    # Latin-1 glyph advances in 1/1000 em, read once per font
+    return tuple(stringWidth(chr(i), font, 1000) for i in range(256))
+
+@lru_cache(maxsize=4096)
+def _measure(font: str, size: float, text: str) -> float:
+    # canvas-independent, so results are shared across slides and documents
+    try:
+        return sum(map(_width_table(font).__getitem__, map(ord, text))) * 0.001 * size
+    except IndexError:
+        # beyond Latin-1: let reportlab handle the encoding
+        return stringWidth(text, font, size)
+
 def _string_width(c: canvas.Canvas, text: str, font: str, size: int) -> float:
-    return c.stringWidth(text or "", font, size)
+    return _measure(font, size, text or "")
 
-def _wrap_text(c: canvas.Canvas, text: str, font: str, size: int, max_width: float) -> List[str]:
-    if not text:
-        return []
-    words = (text or "").split()
+def _wrap_words(words: List[str], font: str, size: float, max_width: float) -> List[str]:
+    """Greedy wrap measuring each word once; line width is tracked as a running sum."""
+    space_w = _measure(font, size, " ")
     lines: List[str] = []
     cur: List[str] = []
+    cur_w = 0.0
     for w in words:
-        trial = (" ".join(cur + [w])).strip()
-        if _string_width(c, trial, font, size) <= max_width or not cur:
+        ww = _measure(font, size, w)
+        trial_w = cur_w + space_w + ww if cur else ww
+        if trial_w <= max_width or not cur:
             cur.append(w)
+            cur_w = trial_w
         else:
             lines.append(" ".join(cur))
             cur = [w]
+            cur_w = ww
     if cur:
         lines.append(" ".join(cur))
     return lines
 
-def _draw_paragraph_block(c, text, x, y, w, font, size, color_hex, leading_mult=1.35) -> float:
-    c.setFont(font, size)
-    c.setFillColor(HexColor(color_hex))
-    lines = _wrap_text(c, text, font, size, w)
-    leading = size * leading_mult
+@lru_cache(maxsize=2048)
+def _wrap_cached(font: str, size: float, max_width: float, text: str) -> Tuple[str, ...]:
+    # layout is a pure function of its arguments; repeated bullets and boilerplate hit here
+    return tuple(_wrap_words(text.split(), font, size, max_width))
+
+def _wrap_text(c: canvas.Canvas, text: str, font: str, size: int, max_width: float) -> Tuple[str, ...]:
+    if not text:
+        return ()
+    return _wrap_cached(font, size, max_width, text)
+
+def _draw_paragraph_block_raw(c, lines, x, y, leading) -> float:
+    # caller has already set font + fill color; one BT/ET text object per paragraph
+    if not lines:
+        return y
+    to = c.beginText(x, y)
+    to.setLeading(leading)
     for line in lines:
-        c.drawString(x, y, line)
-        y -= leading
-    return y
+        to.textLine(line)
+    c.drawText(to)
+    return y - leading * len(lines)
+
+def _draw_paragraph_block(c, text, x, y, w, font, size, color, leading_mult=1.35) -> float:
+    c.setFont(font, size)
+    c.setFillColor(color)
+    return _draw_paragraph_block_raw(c, _wrap_text(c, text, font, size, w), x, y, size * leading_mult)
 
 def _draw_bullet_block(
     c,
@@ -161,7 +276,7 @@ def _draw_bullet_block(
     w,
     font,
     size,
-    color_hex,
+    color,
     marker="square",     # "square" | "dot"
     leading_mult=1.32,   # slightly tighter than paragraphs
     indent=18.0,         # text indent from marker edge
@@ -172,77 +287,72 @@ def _draw_bullet_block(
     Draws a uniform bullet list with fixed-size markers and aligned text.
     """
     c.setFont(font, size)
-    c.setFillColor(HexColor(color_hex))
+    c.setFillColor(color)
 
     # marker block width = marker + gap
     marker_block_w = marker_size + gap
     usable_w = max(0.0, w - indent - marker_block_w)
     leading = size * leading_mult
 
-    for raw in (items or []):
-        text = (raw or "").strip()
-        if not text:
-            continue
-
-        # marker baseline aligns with first text line baseline
-        marker_x = x
-        marker_y = y - (size * 0.75) + (marker_size * 0.5)
-
-        if marker == "dot":
-            # draw a filled circle
-            c.circle(marker_x + marker_size / 2.0, marker_y, marker_size / 2.0, stroke=0, fill=1)
-        else:
-            # draw a filled square
-            c.rect(marker_x, marker_y - marker_size / 2.0, marker_size, marker_size, stroke=0, fill=1)
-
-        # wrap the bullet text
-        text_x = x + indent + marker_block_w
-        y = _draw_paragraph_block(c, text, text_x, y, usable_w, font, size, color_hex, leading_mult)
+    text_x = x + indent + marker_block_w
+    item_gap = max(4.0, size * 0.18)
+
+    units = [_wrap_text(c, t, font, size, usable_w) for t in (i.strip() for i in (items or [])) if t]
+    return _emit_bullets(c, units, marker, True, x, y, size, leading, item_gap, text_x, marker_size)
+
+def _emit_bullets(c, units, marker, marked, x, y, size, leading, item_gap, text_x, marker_size) -> float:
+    # caller has set font + fill color; units are already wrapped.
+    # marked=False leaves the first unit without a marker (an item continued from the previous page)
+    markers = c.beginPath()
+    placed = []   # (first baseline y, wrapped lines)
+    for n, lines in enumerate(units):
+        if marked or n:
+            # marker baseline aligns with first text line baseline
+            marker_y = y - (size * 0.75) + (marker_size * 0.5)
+            if marker == "dot":
+                markers.circle(x + marker_size / 2.0, marker_y, marker_size / 2.0)
+            else:
+                markers.rect(x, marker_y - marker_size / 2.0, marker_size, marker_size)
+        placed.append((y, lines))
+        y -= leading * len(lines) + item_gap
 
-        # inter-item gap
-        y -= max(4.0, size * 0.18)
+    # one fill for every marker, then the text
+    if len(placed) > (0 if marked else 1):
+        c.drawPath(markers, stroke=0, fill=1)
+    for ty, lines in placed:
+        _draw_paragraph_block_raw(c, lines, text_x, ty, leading)
 
     return y
 
 
-def draw_page_background(c: canvas.Canvas, theme: dict, page_w: float, page_h: float):
-    _assert_theme_dict(theme)
-    colors = theme.get("colors", {})
-    bg = colors.get("bg", "#FFFFFF")
-    c.setFillColor(HexColor(bg))
+def draw_page_background(c: canvas.Canvas, rt: _RT, page_w: float, page_h: float):
+    c.setFillColor(rt.bg)
     c.rect(0, 0, page_w, page_h, stroke=0, fill=1)
 
-def draw_footer(c: canvas.Canvas, theme: dict, page_w: float, page_h: float, page_num: int):
-    fonts = theme.get("fonts", {})
-    sizes = theme.get("sizes", {})
-    colors = theme.get("colors", {})
-    text_hex = colors.get("muted", colors.get("text", "#333333"))
-    c.setFont(fonts.get("body", "Helvetica"), int(sizes.get("footer", 10)))
-    c.setFillColor(HexColor(text_hex))
+def draw_footer(c: canvas.Canvas, rt: _RT, page_w: float, page_h: float, page_num: int):
+    c.setFont(rt.body_font, rt.footer_size)
+    c.setFillColor(rt.muted)
     label = f"Page {page_num}"
-    tw = _string_width(c, label, fonts.get("body", "Helvetica"), int(sizes.get("footer", 10)))
+    tw = _string_width(c, label, rt.body_font, rt.footer_size)
     c.drawString((page_w - tw) / 2.0, 18, label)
 
-def draw_title_in_band(c, title, band_top, band_h, theme, page_w, align="left"):
-    colors = theme.get("colors", {})
-    fonts  = theme.get("fonts", {})
-    sizes  = theme.get("sizes", {})
-    band_hex = colors.get("accent", "#222222")
-    text_hex = _accessible_text_color(band_hex)
+_BAND_TEXT_X = 24.0   # left inset of band titles
+
+def draw_title_in_band(c, title, band_top, band_h, rt: _RT, page_w, align="left"):
     y0 = band_top - band_h
-    c.setFillColor(HexColor(band_hex))
+    c.setFillColor(rt.band)
     c.rect(0, y0, page_w, band_h, stroke=0, fill=1)
 
-    title_font = fonts.get("title", "Helvetica-Bold")
-    title_size = int(sizes.get("h2", sizes.get("title", 20)))
+    title_font = rt.hdr_font
+    title_size = rt.hdr_size
     c.setFont(title_font, title_size)
-    c.setFillColor(HexColor(text_hex))
+    c.setFillColor(rt.band_text)
     t = title or "Untitled"
     tw = _string_width(c, t, title_font, title_size)
     if align == "center":
         x = (page_w - tw) / 2.0
     else:
-        x = 24.0
+        x = _BAND_TEXT_X
     c.drawString(x, y0 + (band_h - title_size) / 2.0, t)
 
 def get_content_frame(page_w: float, page_h: float, theme: dict) -> Tuple[float, float, float, float]:
@@ -252,68 +362,153 @@ def get_content_frame(page_w: float, page_h: float, theme: dict) -> Tuple[float,
 # Expanded content renderer
 # --------------------------------------------------------------------------------------
 
-def draw_expanded_content(c, slide, theme, content_x, content_y, content_w, content_h) -> float:
-    fonts  = theme.get("fonts", {})
-    sizes  = theme.get("sizes", {})
-    colors = theme.get("colors", {})
-    bg     = colors.get("bg", "#FFFFFF")
-    body_font = fonts.get("body", "Helvetica")
-    body_size = int(sizes.get("body", 12))
-    hdr_font  = fonts.get("title", "Helvetica-Bold")
-    hdr_size  = int(sizes.get("h2", sizes.get("title", 20)))
-    hdr_hex   = colors.get("accent", "#2563EB")
-    text_hex  = _accessible_text_color(bg)
-
-    y = content_y
+class _SlideView(NamedTuple):
+    """The slide fields the notes pages read, with blank entries already dropped."""
+    title: str
+    expanded: str | List[str] | None
+    concepts: List[str]
+    details: List[str]
 
-    # A) Overview (was Main Narrative)
+def _slide_view(slide) -> _SlideView:
     narrative = getattr(slide, "expanded_content", None)
-    if narrative:
-        c.setFont(hdr_font, hdr_size)
-        c.setFillColor(HexColor(hdr_hex))
-        c.drawString(content_x, y, "Overview")
-        y -= hdr_size * 1.2
+    # blank content never gets a header
+    if isinstance(narrative, str):
+        narrative = narrative if narrative.strip() else None
+    elif narrative:
+        narrative = [p for p in narrative if p and p.strip()]
+    return _SlideView(
+        title=getattr(slide, "title", "Untitled"),
+        expanded=narrative or None,
+        concepts=[i for i in (getattr(slide, "key_concepts", None) or []) if i and i.strip()],
+        details=[i for i in (getattr(slide, "supporting_details", None) or []) if i and i.strip()],
+    )
+
+# bullet geometry shared by both bullet sections
+_BULLET_INDENT = 18.0
+_BULLET_MARKER = 6.0
+_BULLET_GAP = 6.0
+
+class _Section(NamedTuple):
+    """A notes section wrapped for drawing; one paragraph or bullet item per unit."""
+    header: str
+    kind: str                        # "paras" | "square" | "dot"
+    units: Tuple[Tuple[str, ...], ...]
+    leading: float
+    unit_gap: float                  # space after every unit
+    marked: bool = True              # False when the first bullet continues from the previous page
+
+    def unit_height(self, i: int) -> float:
+        return self.leading * len(self.units[i]) + self.unit_gap
+
+def _measure_expanded_height(rt: _RT, view: _SlideView, content_w: float) -> List[Tuple[_Section, float]]:
+    """Wrap every section of a slide once, without touching a canvas.
+
+    Returns each section with its full height (header, units and the gap after it);
+    pagination and drawing both work from these line lists.
+    """
+    font, size = rt.body_font, rt.body_size
+    out: List[Tuple[_Section, float]] = []
+
+    def add(sec: _Section) -> None:
+        h = rt.hdr_advance + sum(sec.unit_height(i) for i in range(len(sec.units))) + rt.section_gap
+        out.append((sec, h))
 
+    narrative = view.expanded
+    if narrative:
         if isinstance(narrative, str):
-            y = _draw_paragraph_block(c, narrative, content_x, y, content_w, body_font, body_size, text_hex)
+            # a single narrative string has no trailing paragraph gap
+            units, gap = (narrative,), 0.0
         else:
-            for para in narrative:
-                y = _draw_paragraph_block(c, para, content_x, y, content_w, body_font, body_size, text_hex)
-                y -= max(6.0, body_size * 0.2)
-
-        y -= max(8.0, body_size * 0.3)
-
-    # B) Core Ideas (was Key Concepts)
-    concepts = getattr(slide, "key_concepts", None)
-    if concepts:
-        c.setFont(hdr_font, hdr_size)
-        c.setFillColor(HexColor(hdr_hex))
-        c.drawString(content_x, y, "Core Ideas")
-        y -= hdr_size * 1.2
-
-        y = _draw_bullet_block(
-            c, concepts, content_x, y, content_w, body_font, body_size, text_hex,
-            marker="square", indent=18.0, marker_size=6.0
-        )
-        y -= max(8.0, body_size * 0.3)
-
-    # C) Examples & Pitfalls (was Supporting Details)
-    details = getattr(slide, "supporting_details", None)
-    if details:
-        c.setFont(hdr_font, hdr_size)
-        c.setFillColor(HexColor(hdr_hex))
-        c.drawString(content_x, y, "Examples & Pitfalls")
-        y -= hdr_size * 1.2
-
-        y = _draw_bullet_block(
-            c, details, content_x, y, content_w, body_font, body_size, text_hex,
-            marker="dot", indent=18.0, marker_size=6.0
-        )
-
-        y -= max(8.0, body_size * 0.3)
+            units, gap = narrative, rt.para_gap
+        add(_Section("Overview", "paras",
+                     tuple(_wrap_text(None, p, font, size, content_w) for p in units),
+                     size * 1.35, gap))
+
+    bullet_w = max(0.0, content_w - _BULLET_INDENT - _BULLET_MARKER - _BULLET_GAP)
+    for header, kind, items in (("Core Ideas", "square", view.concepts),
+                                ("Examples & Pitfalls", "dot", view.details)):
+        if items:
+            add(_Section(header, kind,
+                         tuple(_wrap_text(None, t.strip(), font, size, bullet_w) for t in items),
+                         size * 1.32, max(4.0, size * 0.18)))
+    return out
+
+def _paginate_sections(measured: List[Tuple[_Section, float]], rt: _RT, top: float, bottom: float) -> List[List[_Section]]:
+    """Split measured sections into pages whose text stays above bottom.
+
+    Sections break between units, repeating their header on the next page; a
+    unit taller than a whole page is split by lines.
+    """
+    pages: List[List[_Section]] = [[]]
+    y = top
+    for sec, h in measured:
+        # the gap after the last unit/section may run past the bottom
+        if y - (h - rt.section_gap - sec.unit_gap) >= bottom:
+            pages[-1].append(sec)
+            y -= h
+            continue
 
+        units, marked = list(sec.units), sec.marked
+        while units:
+            avail = y - rt.hdr_advance - bottom
+            used, n = 0.0, 0
+            while n < len(units) and used + sec.leading * len(units[n]) <= avail:
+                used += sec.leading * len(units[n]) + sec.unit_gap
+                n += 1
+            if n == 0:
+                if pages[-1]:
+                    pages.append([])
+                    y = top
+                    continue
+                # nothing else on this page: split the unit itself
+                k = max(1, int(avail // sec.leading))
+                head, tail = units[0][:k], units[0][k:]
+                pages[-1].append(sec._replace(units=(head,), marked=marked))
+                units = [tail] + units[1:] if tail else units[1:]
+                marked = not tail
+                if units:
+                    pages.append([])
+                    y = top
+                else:
+                    y -= rt.hdr_advance + sec.leading * len(head) + sec.unit_gap + rt.section_gap
+                continue
+            part = sec._replace(units=tuple(units[:n]), marked=marked)
+            pages[-1].append(part)
+            y -= rt.hdr_advance + used + rt.section_gap
+            units, marked = units[n:], True
+            if units:
+                pages.append([])
+                y = top
+    return pages
+
+def _draw_sections(c, sections: Iterable[_Section], rt: _RT, x: float, y: float) -> float:
+    """Draw pre-wrapped sections from baseline y down; returns the next free y."""
+    for sec in sections:
+        c.setFont(rt.hdr_font, rt.hdr_size)
+        c.setFillColor(rt.hdr)
+        c.drawString(x, y, sec.header)
+        y -= rt.hdr_advance
+
+        # one body style for every unit of the section
+        c.setFont(rt.body_font, rt.body_size)
+        c.setFillColor(rt.text)
+        if sec.kind == "paras":
+            for lines in sec.units:
+                y = _draw_paragraph_block_raw(c, lines, x, y, sec.leading)
+                y -= sec.unit_gap
+        else:
+            y = _emit_bullets(
+                c, sec.units, sec.kind, sec.marked, x, y, rt.body_size, sec.leading, sec.unit_gap,
+                x + _BULLET_INDENT + _BULLET_MARKER + _BULLET_GAP, _BULLET_MARKER,
+            )
+        y -= rt.section_gap
     return y
 
+def draw_expanded_content(c, view: _SlideView, rt: _RT, content_x, content_y, content_w, content_h) -> float:
+    """Draw every section of a slide in one run (no page breaks); returns the next free y."""
+    measured = _measure_expanded_height(rt, view, content_w)
+    return _draw_sections(c, (sec for sec, _ in measured), rt, content_x, content_y)
+
 # --------------------------------------------------------------------------------------
 # Public API
 # --------------------------------------------------------------------------------------
@@ -328,103 +523,103 @@ def _draw_center_title_fitted(c, title, theme, page_w, page_h):
     min_size = max(18, int(sizes.get("title", 20)))
     max_width = cf_w * 0.9
 
-    c.setFillColor(HexColor(_accessible_text_color(bg)))
+    c.setFillColor(_hc(_accessible_text_color(bg)))
     text = title or "Untitled"
 
-    while size > min_size and c.stringWidth(text, font, size) > max_width:
+    while size > min_size and _string_width(c, text, font, size) > max_width:
         size -= 1
 
     lines = [text]
-    if c.stringWidth(text, font, size) > max_width:
-        words = text.split()
-        lines = []
-        cur = []
-        for w in words:
-            trial = (" ".join(cur + [w])).strip()
-            if c.stringWidth(trial, font, size) <= max_width or not cur:
-                cur.append(w)
-            else:
-                lines.append(" ".join(cur))
-                cur = [w]
-        if cur:
-            lines.append(" ".join(cur))
+    if _string_width(c, text, font, size) > max_width:
+        lines = _wrap_words(text.split(), font, size, max_width)
         if len(lines) > 2:
             head = lines[0]
-            tail = " ".join(lines[1:])
-            ell = "…"
-            while size > min_size and c.stringWidth(tail + ell, font, size) > max_width:
+            # joined once; only the size changes while shrinking
+            tail = " ".join(lines[1:]) + "…"
+            while size > min_size and _string_width(c, tail, font, size) > max_width:
                 size -= 1
-            lines = [head, tail + ell]
+            lines = [head, tail]
 
     leading = size * 1.1
     total_h = size if len(lines) == 1 else size + leading
     start_y = cf_y + cf_h/2 + total_h/2 - size
 
     c.setFont(font, size)
+    # centered lines differ in x, so each is positioned inside a single text object
+    to = c.beginText()
     for i, line in enumerate(lines[:2]):
-        tw = c.stringWidth(line, font, size)
-        x = cf_x + (cf_w - tw) / 2.0
-        y = start_y - i * leading
-        c.drawString(x, y, line)
+        tw = _string_width(c, line, font, size)
+        to.setTextOrigin(cf_x + (cf_w - tw) / 2.0, start_y - i * leading)
+        to.textOut(line)
+    c.drawText(to)
 
-def build_enhanced_pdf(plan, theme: dict, **kwargs) -> bytes:
+def build_enhanced_pdf(plan, theme: dict, compress: bool = True, **kwargs) -> bytes:
     _assert_theme_dict(theme)
 
     page_w, page_h = _choose_page_size(plan)
-    buf = BytesIO()
-    c = canvas.Canvas(buf, pagesize=(page_w, page_h))
+    # no file target: the canvas hands back the finished document itself, so there
+    # is no intermediate BytesIO to grow and then copy out of
+    # explicit, so output size does not depend on the site's rl_config defaults
+    c = canvas.Canvas(None, pagesize=(page_w, page_h), pageCompression=1 if compress else 0)
+    _render_enhanced(c, plan, theme, page_w, page_h)
+    return c.getpdfdata()
+
+def build_enhanced_pdf_to(plan, theme: dict, out: BinaryIO, compress: bool = True, **kwargs) -> None:
+    """Same document as build_enhanced_pdf, written straight into a caller-owned binary stream."""
+    _assert_theme_dict(theme)
+
+    page_w, page_h = _choose_page_size(plan)
+    c = canvas.Canvas(out, pagesize=(page_w, page_h), pageCompression=1 if compress else 0)
+    _render_enhanced(c, plan, theme, page_w, page_h)
+    c.save()
+
+def _render_enhanced(c: canvas.Canvas, plan, theme: dict, page_w: float, page_h: float) -> None:
+    """Draw every page of the enhanced notes onto c (the caller saves or collects it)."""
     c.setTitle(getattr(plan, "topic", "EduSynth Notes"))
 
     scale = _compute_scale(page_w)
     theme_eff = _apply_scale_to_theme(theme, scale)
-    fonts  = theme_eff.get("fonts", {})
-    sizes  = theme_eff.get("sizes", {})
-    colors = theme_eff.get("colors", {})
     spacing = theme_eff.get("spacing", {"sm":8,"md":12,"lg":16,"xl":24})
     band_cfg = theme_eff.get("band", {"height_em":2.0, "gap_below_em":0.9})
+    # fonts, sizes and colors (incl. contrast picks) resolved once for every page
+    rt = _get_resolved_theme(theme, scale)
 
     # Page 1: Title splash
-    draw_page_background(c, theme_eff, page_w, page_h)
+    draw_page_background(c, rt, page_w, page_h)
     _draw_center_title_fitted(c, getattr(plan, "topic", "Untitled"), theme_eff, page_w, page_h)
-    draw_footer(c, theme_eff, page_w, page_h, page_num=1)
+    draw_footer(c, rt, page_w, page_h, page_num=1)
     c.showPage()
 
     # Slides
     page_num = 2
-    slides = list(getattr(plan, "slides", []))
+    # normalize every slide once; the page loop below only formats
+    views = [_slide_view(s) for s in getattr(plan, "slides", [])]
     cf_x, cf_y, cf_w, cf_h = get_content_frame(page_w, page_h, theme_eff)
     safe_top = float(theme_eff.get("layout", {}).get("safe_top", 48.0))
 
-    for slide in slides:
-        draw_page_background(c, theme_eff, page_w, page_h)
-
-        # Header band (contrast-safe)
-        h2_size = int(sizes.get("h2", sizes.get("title", 20)))
-        band_h = max(48, int(h2_size * float(band_cfg.get("height_em", 2.0))))
-        band_top = page_h - safe_top / 2.0
-        draw_title_in_band(c, getattr(slide, "title", "Untitled"), band_top, band_h, theme_eff, page_w, align="left")
-
-        # Content start: always below band with clear gap
-        band_gap = int(h2_size * float(band_cfg.get("gap_below_em", 0.9)))
-        start_y = min(
-            cf_y + cf_h - int(h2_size * 0.6),
-            band_top - (band_h + band_gap)
-        )
-
-
-        _ = draw_expanded_content(
-            c=c,
-            slide=slide,
-            theme=theme_eff,
-            content_x=cf_x,
-            content_y=start_y,
-            content_w=cf_w,
-            content_h=cf_h,
-        )
-
-        draw_footer(c, theme_eff, page_w, page_h, page_num=page_num)
-        c.showPage()
-        page_num += 1
-
-    c.save()
-    return buf.getvalue()
+    # header band geometry and content start are the same on every page
+    h2_size = rt.hdr_size
+    band_h = max(48, int(h2_size * float(band_cfg.get("height_em", 2.0))))
+    band_top = page_h - safe_top / 2.0
+    # Content start: always below band with clear gap
+    band_gap = int(h2_size * float(band_cfg.get("gap_below_em", 0.9)))
+    start_y = min(
+        cf_y + cf_h - int(h2_size * 0.6),
+        band_top - (band_h + band_gap)
+    )
+
+    for view in views:
+        # measure once, break into pages, then draw the already-wrapped lines
+        measured = _measure_expanded_height(rt, view, cf_w)
+        for i, sections in enumerate(_paginate_sections(measured, rt, start_y, cf_y)):
+            draw_page_background(c, rt, page_w, page_h)
+
+            # Header band (contrast-safe)
+            title = view.title if i == 0 else f"{view.title} (cont.)"
+            draw_title_in_band(c, title, band_top, band_h, rt, page_w, align="left")
+
+            _draw_sections(c, sections, rt, cf_x, start_y)
+
+            draw_footer(c, rt, page_w, page_h, page_num=page_num)
+            c.showPage()
+            page_num += 1
@@ -2,16 +2,24 @@
 PPTX builder with visual themes and adaptive layout matching PDF quality.
 Simplified to heading + bullet points format only.
 """
+from copy import deepcopy
+from dataclasses import dataclass
+from functools import lru_cache
 from io import BytesIO
 from typing import Dict, Any, Tuple, List, Optional
-import math
+import os
 
+import numpy as np
+import pptx
 from pptx import Presentation
 from pptx.util import Inches, Pt
 from pptx.enum.text import PP_ALIGN, MSO_ANCHOR
 from pptx.enum.shapes import MSO_SHAPE
+from pptx.opc.constants import RELATIONSHIP_TYPE as RT
+from pptx.oxml.ns import qn
 from pptx.dml.color import RGBColor
-from PIL import Image, ImageDraw
+from PIL import Image
+from reportlab.pdfbase.pdfmetrics import stringWidth
 
 from app.schemas.slides import LecturePlan, SlideItem
 from .icons import get_point_icon
@@ -20,12 +28,20 @@ from .theme_tokens import get_theme
 
 # --- Color Conversion Helpers ----------------------------------------------
 
+@lru_cache(maxsize=64)
 def _hex_to_rgb_int(hex_color: str) -> Tuple[int, int, int]:
     """Convert #RRGGBB -> (r,g,b) ints 0..255."""
     hc = (hex_color or "#000000").lstrip("#")
     if len(hc) != 6:
         raise ValueError(f"Invalid hex color: {hex_color}")
-    return tuple(int(hc[i : i + 2], 16) for i in (0, 2, 4))
+    v = int(hc, 16)
+    return ((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
+
+
+@lru_cache(maxsize=64)
+def _rgb_color(hex_color: str) -> RGBColor:
+    """#RRGGBB -> RGBColor; immutable, so one instance serves every shape."""
+    return RGBColor(*_hex_to_rgb_int(hex_color))
 
 
 def _blend_with_white(rgb: Tuple[int, int, int], alpha: float) -> Tuple[int, int, int]:
@@ -33,16 +49,17 @@ def _blend_with_white(rgb: Tuple[int, int, int], alpha: float) -> Tuple[int, int
     return tuple(int(255 * (1 - alpha) + c * alpha) for c in rgb)
 
 
-def _srgb_to_linear(c: float) -> float:
-    c = c / 255.0
-    if c <= 0.04045:
-        return c / 12.92
-    return ((c + 0.055) / 1.055) ** 2.4
+# channels are 0..255 ints, so the sRGB -> linear curve is a 256-entry table
+_SRGB_TO_LIN: Tuple[float, ...] = tuple(
+    (v / 255.0) / 12.92 if v / 255.0 <= 0.04045 else ((v / 255.0 + 0.055) / 1.055) ** 2.4
+    for v in range(256)
+)
 
 
 def _relative_luminance(rgb: Tuple[int, int, int]) -> float:
     r, g, b = rgb
-    return 0.2126 * _srgb_to_linear(r) + 0.7152 * _srgb_to_linear(g) + 0.0722 * _srgb_to_linear(b)
+    lut = _SRGB_TO_LIN
+    return 0.2126 * lut[r] + 0.7152 * lut[g] + 0.0722 * lut[b]
 
 
 def _contrast_ratio(rgb1: Tuple[int, int, int], rgb2: Tuple[int, int, int]) -> float:
@@ -63,6 +80,20 @@ def _px_to_inches(px: float, dpi: float = 96.0) -> float:
     return float(px) / float(dpi)
 
 
+EMU_PER_INCH = 914400
+
+
+def _emu(inches: float) -> int:
+    """Inches -> EMU int, truncating exactly like pptx.util.Inches."""
+    return int(inches * EMU_PER_INCH)
+
+
+# fixed shape sizes, already in EMU
+_FOOTER_H_EMU = _emu(0.3)
+_DIVIDER_H_EMU = _emu(0.01)
+_BULLET_MARGIN_EMU = _emu(0.2)
+
+
 # --- Slide Size / Presets --------------------------------------------------
 
 PRESETS = {
@@ -134,70 +165,207 @@ def _get_safe_frame(prs: Presentation, theme: Dict[str, Any]) -> Tuple[float, fl
     return (left, top, width, height)
 
 
+@dataclass(frozen=True, slots=True)
+class LayoutCtx:
+    """Per-deck layout constants (inches, points, shared RGBColor values), resolved once in build_pptx."""
+    frame_left: float
+    frame_top: float
+    frame_w: float
+    frame_h: float
+    body_size: int
+    leading: float
+    para_gap: float
+    line_h_in: float
+    line_spacing: float             # bullet line spacing as a multiple of body_size
+    max_bullets: int
+    display_size: int
+    title_size: int
+    footer_size: int
+    footer_top: float
+    text_color: RGBColor
+    muted_color: RGBColor
+    title_font: str
+    body_font: str
+    theme_key: str
+    icons: Tuple[str, ...]          # bullet icon for each slot on a page
+    # shape geometry in EMU, passed straight to python-pptx
+    frame_left_emu: int
+    frame_top_emu: int
+    frame_w_emu: int
+    frame_h_emu: int
+    title_top_emu: int
+    band_h_emu: int
+    bullets_top_emu: int
+    bullets_h_emu: int
+    footer_top_emu: int
+    footer_text_top_emu: int
+
+
+def _layout_ctx(prs: Presentation, theme: Dict[str, Any], sizes: Dict[str, float]) -> LayoutCtx:
+    frame_left, frame_top, frame_w, frame_h = _get_safe_frame(prs, theme)
+    layout = theme.get("layout", {})
+
+    body_size = sizes["body"]
+    leading = body_size * layout.get("bullet_leading", 1.35)
+    para_gap = layout.get("para_gap_pt", 10)
+    line_h_in = (leading + para_gap) / 72.0
+    available_h = frame_h - 1.5  # More space reserved for title
+    max_bullets = max(4, int(available_h / line_h_in))
+    theme_key = theme.get("name", "minimalist")
+
+    # Title band - with more top padding
+    band_h = 1.0  # Increased height
+    title_top = frame_top + 0.3  # Added top padding
+    # Bullets area - starts lower to account for title padding
+    bullets_top = title_top + band_h + 0.3  # More gap after title
+    bullets_h = frame_h - (bullets_top - frame_top)
+    footer_top = prs.slide_height.inches - _px_to_inches(layout.get("safe_bottom", 48)) - 0.3
+
+    return LayoutCtx(
+        frame_left=frame_left,
+        frame_top=frame_top,
+        frame_w=frame_w,
+        frame_h=frame_h,
+        body_size=body_size,
+        leading=leading,
+        para_gap=para_gap,
+        line_h_in=line_h_in,
+        line_spacing=leading / body_size,
+        max_bullets=max_bullets,
+        display_size=sizes["display"],
+        title_size=sizes["title"],
+        footer_size=sizes["footer"],
+        footer_top=footer_top,
+        text_color=_rgb_color(theme["colors"]["text"]),
+        muted_color=_rgb_color(theme["colors"]["muted"]),
+        title_font=theme["fonts"].get("title", "Helvetica-Bold"),
+        body_font=theme["fonts"].get("body", "Helvetica"),
+        theme_key=theme_key,
+        icons=tuple(get_point_icon(theme_key, i) for i in range(max_bullets)),
+        frame_left_emu=_emu(frame_left),
+        frame_top_emu=_emu(frame_top),
+        frame_w_emu=_emu(frame_w),
+        frame_h_emu=_emu(frame_h),
+        title_top_emu=_emu(title_top),
+        band_h_emu=_emu(band_h),
+        bullets_top_emu=_emu(bullets_top),
+        bullets_h_emu=_emu(bullets_h),
+        footer_top_emu=_emu(footer_top),
+        footer_text_top_emu=_emu(footer_top + 0.05),
+    )
+
+
 # --- Background Rendering --------------------------------------------------
 
-def _background_image_bytes(theme: Dict[str, Any], width_px: int, height_px: int) -> bytes:
-    """Render vertical gradient PNG matching theme background."""
+_VIGNETTE_INSET = 96.0   # px from the edge where the vignette fades to nothing
+
+def _background_image_bytes(theme: Dict[str, Any], width_px: int, height_px: int) -> Optional[bytes]:
+    """Render vertical gradient PNG matching theme background (None if it cannot be rendered)."""
     bg_grad = theme.get("background_gradient", (theme["colors"]["bg"], theme["colors"]["bg"]))
-    color_a = _hex_to_rgb_int(bg_grad[0])
-    color_b = _hex_to_rgb_int(bg_grad[1])
+    strength = theme.get("vignette", {}).get("strength", 0.0)
+    try:
+        return _render_background_png(bg_grad[0], bg_grad[1], strength, width_px, height_px)
+    except (ValueError, OSError, MemoryError):
+        # bad hex stop, Pillow encoder error, or no room for the raster
+        return None
 
-    img = Image.new("RGB", (max(1, width_px), max(1, height_px)), color_a)
-    draw = ImageDraw.Draw(img)
-    
-    for y in range(height_px):
-        t = y / max(1, height_px - 1)
-        r = int(color_a[0] * (1 - t) + color_b[0] * t)
-        g = int(color_a[1] * (1 - t) + color_b[1] * t)
-        b = int(color_a[2] * (1 - t) + color_b[2] * t)
-        draw.line([(0, y), (width_px, y)], fill=(r, g, b))
-
-    # Vignette overlay
-    vig = theme.get("vignette", {})
-    strength = vig.get("strength", 0.0)
-    if strength > 0.01:
-        overlay = Image.new("RGBA", (width_px, height_px), (0, 0, 0, 0))
-        od = ImageDraw.Draw(overlay)
-        steps = 16
-        for i in range(steps):
-            alpha = int((i / steps) * 255 * strength * 0.6)
-            inset = int((steps - i) * 6)
-            od.rectangle([inset, inset, width_px - inset, height_px - inset], 
-                        fill=(0, 0, 0, alpha))
-        img = Image.alpha_composite(img.convert("RGBA"), overlay).convert("RGB")
+
+@lru_cache(maxsize=8)
+def _render_background_png(grad_a: str, grad_b: str, strength: float, width_px: int, height_px: int) -> bytes:
+    color_a = _hex_to_rgb_int(grad_a)
+    color_b = _hex_to_rgb_int(grad_b)
+
+    width_px, height_px = max(1, width_px), max(1, height_px)
+
+    # one color per row, broadcast across the width
+    t = (np.arange(height_px, dtype=np.float64) / max(1, height_px - 1))[:, None]
+    col = (np.asarray(color_a, dtype=np.float64) * (1 - t) + np.asarray(color_b, dtype=np.float64) * t).astype(np.uint8)
+
+    if strength <= 0.01:
+        # purely vertical: a one-pixel column that add_picture stretches to the slide width
+        bio = BytesIO()
+        Image.fromarray(np.ascontiguousarray(col[:, None, :]), "RGB").save(bio, format="PNG")
+        return bio.getvalue()
+
+    arr = np.broadcast_to(col[:, None, :], (height_px, width_px, 3))
+
+    # Vignette: darken toward the edges, fading out _VIGNETTE_INSET px in
+    ys = np.arange(height_px, dtype=np.float32)
+    xs = np.arange(width_px, dtype=np.float32)
+    d = np.minimum.outer(np.minimum(ys, height_px - 1 - ys), np.minimum(xs, width_px - 1 - xs))
+    alpha = np.clip(1.0 - d / _VIGNETTE_INSET, 0.0, 1.0) * (strength * 0.6)
+    arr = (arr * (1.0 - alpha)[..., None]).astype(np.uint8)
+
+    img = Image.fromarray(np.ascontiguousarray(arr), "RGB")
 
     bio = BytesIO()
     img.save(bio, format="PNG", optimize=True)
     return bio.getvalue()
 
 
-def _add_background(slide, prs: Presentation, theme: Dict[str, Any]):
-    """Add gradient background image to slide."""
+@dataclass(slots=True)
+class _DeckBackground:
+    """The deck's background, resolved once per build (png None means a solid fill).
+
+    The first slide gets the picture through add_picture; image_part and pic keep
+    its part and a copy of its element, so later slides only relate that part and
+    append the copy.
+    """
+    png: Optional[bytes]
+    image_part: Any = None
+    pic: Any = None
+
+
+def _deck_background(prs: Presentation, theme: Dict[str, Any]) -> _DeckBackground:
+    """Render the deck's background PNG once per build."""
+    bg_grad = theme.get("background_gradient", (theme["colors"]["bg"], theme["colors"]["bg"]))
+    if bg_grad[0] == bg_grad[1] and theme.get("vignette", {}).get("strength", 0) < 0.01:
+        # flat color: no image to render, encode or embed
+        return _DeckBackground(None)
+    px_w = int(round(prs.slide_width.inches * 96))
+    px_h = int(round(prs.slide_height.inches * 96))
+    bg_bytes = _background_image_bytes(theme, px_w, px_h)
+    if bg_bytes is None:
+        return _DeckBackground(None)
+    return _DeckBackground(bg_bytes)
+
+
+def _add_background(slide, prs: Presentation, theme: Dict[str, Any], bg: _DeckBackground):
+    """Add gradient background image to slide (a solid fill when bg has no image)."""
+    if bg.png is not None:
+        if bg.pic is None:
+            pic = slide.shapes.add_picture(BytesIO(bg.png), 0, 0, prs.slide_width, prs.slide_height)
+            # now related from this slide, so the package finds the part by its hash
+            bg.image_part = prs.part.package.get_or_add_image_part(BytesIO(bg.png))
+            bg.pic = deepcopy(pic.element)
+            return
+        pic = deepcopy(bg.pic)
+        next(pic.iter(qn("a:blip"))).set(qn("r:embed"), slide.part.relate_to(bg.image_part, RT.IMAGE))
+        _append_shape(slide, pic)
+        return
+    bg_grad = theme.get("background_gradient", (theme["colors"]["bg"], theme["colors"]["bg"]))
+    if bg_grad[0] == bg_grad[1] and theme.get("vignette", {}).get("strength", 0) < 0.01:
+        _solid_background(slide, bg_grad[0])
+        return
+    # Fallback to solid color
     try:
-        px_w = int(round(prs.slide_width.inches * 96))
-        px_h = int(round(prs.slide_height.inches * 96))
-        bg_bytes = _background_image_bytes(theme, px_w, px_h)
-        bio = BytesIO(bg_bytes)
-        slide.shapes.add_picture(bio, Inches(0), Inches(0), 
-                                width=prs.slide_width, height=prs.slide_height)
-    except Exception:
-        # Fallback to solid color
-        try:
-            bg_rgb = _hex_to_rgb_int(theme["colors"]["bg"])
-            slide.background.fill.solid()
-            slide.background.fill.fore_color.rgb = RGBColor(*bg_rgb)
-        except Exception:
-            pass
+        _solid_background(slide, theme["colors"]["bg"])
+    except (KeyError, ValueError):
+        pass
+
+
+def _solid_background(slide, hex_color: str) -> None:
+    slide.background.fill.solid()
+    slide.background.fill.fore_color.rgb = _rgb_color(hex_color)
 
 
 # --- Text Helpers ----------------------------------------------------------
 
-def _add_textbox(slide, left_in, top_in, width_in, height_in, text, font_name, 
-                 font_size, color_rgb, bold=False, alignment=PP_ALIGN.LEFT, 
+def _add_textbox(slide, left, top, width, height, text, font_name, 
+                 font_size, color, bold=False, alignment=PP_ALIGN.LEFT, 
                  vertical_anchor=MSO_ANCHOR.TOP):
-    """Add a text box with specified formatting."""
-    tb = slide.shapes.add_textbox(Inches(left_in), Inches(top_in), 
-                                  Inches(width_in), Inches(height_in))
+    """Add a text box with specified formatting. Geometry is in EMU."""
+    tb = slide.shapes.add_textbox(left, top, width, height)
     tf = tb.text_frame
     tf.text = text
     tf.word_wrap = True
@@ -207,42 +375,70 @@ def _add_textbox(slide, left_in, top_in, width_in, height_in, text, font_name,
     p.alignment = alignment
     p.font.size = Pt(font_size)
     p.font.bold = bold
-    p.font.color.rgb = RGBColor(*color_rgb)
-    
-    try:
-        p.font.name = font_name
-    except Exception:
-        pass
+    p.font.color.rgb = color
+    p.font.name = font_name
     
     return tb
 
 
-def _text_fits_width(text: str, font_size: float, max_width_in: float) -> bool:
-    """Rough check if text fits in width (approximation)."""
-    # More conservative estimate: average character width in inches
-    # Using 0.5 for typical proportional fonts
-    approx_width = len(text) * 0.5 * font_size / 72.0
-    return approx_width <= max_width_in
+@lru_cache(maxsize=256)
+def _text_width_in(text: str, font_name: str, font_size: float) -> float:
+    """Width of text in inches, from the font's metrics when reportlab knows the face."""
+    try:
+        return stringWidth(text, font_name, font_size) / 72.0
+    except KeyError:
+        # unknown face: average character width of typical proportional fonts
+        return len(text) * 0.5 * font_size / 72.0
+
+
+def _fit_font_size(text: str, font_name: str, font_size: int, max_width_in: float, min_size: int = 18) -> int:
+    """Largest size <= font_size at which text fits max_width_in, but never below min_size."""
+    # width scales linearly with size, so one measurement solves it
+    width_in = _text_width_in(text, font_name, font_size)
+    if width_in <= max_width_in:
+        return font_size
+    return max(min_size, min(font_size, int(font_size * max_width_in / width_in)))
 
 
 # --- Slide Renderers -------------------------------------------------------
 
-def _title_splash(prs: Presentation, plan: LecturePlan, theme: Dict[str, Any], sizes: Dict[str, float]):
+@lru_cache(maxsize=16)
+def _splash_colors(theme_key: str, accent_hex: str, text_hex: str, bg_hex: str) -> Tuple[RGBColor, RGBColor]:
+    """(ornament fill, title color) for the splash; fixed per theme, so computed once."""
+    accent_rgb = _hex_to_rgb_int(accent_hex)
+    text_rgb = _hex_to_rgb_int(text_hex)
+    
+    if theme_key == "minimalist":
+        ornament_fill = _blend_with_white(accent_rgb, 0.12)
+    elif theme_key == "chalkboard":
+        ornament_fill = _blend_with_white(accent_rgb, 0.25)
+    else:  # corporate
+        ornament_fill = _blend_with_white(accent_rgb, 0.15)
+    
+    # Ensure sufficient contrast between ornament and title text (important for chalkboard)
+    title_color_rgb = text_rgb
+    try:
+        if _contrast_ratio(ornament_fill, text_rgb) < 4.5:
+            # Use dark background color (theme bg) for text when ornament is too light
+            title_color_rgb = _hex_to_rgb_int(bg_hex)
+    except Exception:
+        title_color_rgb = text_rgb
+    return RGBColor(*ornament_fill), RGBColor(*title_color_rgb)
+
+
+def _title_splash(prs: Presentation, plan: LecturePlan, theme: Dict[str, Any], ctx: LayoutCtx,
+                  bg: _DeckBackground):
     """Render title splash slide (page 1)."""
     slide = prs.slides.add_slide(prs.slide_layouts[6])
-    _add_background(slide, prs, theme)
+    _add_background(slide, prs, theme, bg)
     
-    frame_left, frame_top, frame_w, frame_h = _get_safe_frame(prs, theme)
+    frame_left, frame_top, frame_w, frame_h = ctx.frame_left, ctx.frame_top, ctx.frame_w, ctx.frame_h
     
     # Title text preparation
-    title_font = theme["fonts"].get("title", "Helvetica-Bold")
-    text_rgb = _hex_to_rgb_int(theme["colors"]["text"])
     title_text = plan.topic
     
     # Adaptive font sizing - much more aggressive
-    display_size = sizes["display"]
-    while display_size > 18 and not _text_fits_width(title_text, display_size, frame_w * 0.75):
-        display_size -= 2
+    display_size = _fit_font_size(title_text, ctx.title_font, ctx.display_size, frame_w * 0.75)
     
     # Calculate ornament size based on actual text dimensions
     # Rough estimate: width needs padding, height based on font size
@@ -253,46 +449,24 @@ def _title_splash(prs: Presentation, plan: LecturePlan, theme: Dict[str, Any], s
     ornament_left = frame_left + (frame_w - ornament_w) / 2
     ornament_top = frame_top + (frame_h - ornament_h) / 2
     
-    # Theme-specific ornament
-    theme_key = theme.get("name", "minimalist")
-    accent_rgb = _hex_to_rgb_int(theme["colors"]["accent"])
-    
-    if theme_key == "minimalist":
-        ornament_fill = _blend_with_white(accent_rgb, 0.12)
-    elif theme_key == "chalkboard":
-        ornament_fill = _blend_with_white(accent_rgb, 0.25)
-    else:  # corporate
-        ornament_fill = _blend_with_white(accent_rgb, 0.15)
+    # Theme-specific ornament, and a title color that reads on it
+    colors = theme["colors"]
+    ornament_fill, title_color = _splash_colors(ctx.theme_key, colors["accent"], colors["text"], colors["bg"])
     
-    ornament = slide.shapes.add_shape(
-        MSO_SHAPE.ROUNDED_RECTANGLE,
-        Inches(ornament_left), Inches(ornament_top),
-        Inches(ornament_w), Inches(ornament_h)
-    )
+    ornament_box = (_emu(ornament_left), _emu(ornament_top), _emu(ornament_w), _emu(ornament_h))
+    ornament = slide.shapes.add_shape(MSO_SHAPE.ROUNDED_RECTANGLE, *ornament_box)
     ornament.fill.solid()
-    ornament.fill.fore_color.rgb = RGBColor(*ornament_fill)
+    ornament.fill.fore_color.rgb = ornament_fill
     ornament.line.fill.background()
     
     # Title centered - use same dimensions as ornament
-    # Ensure sufficient contrast between ornament and title text (important for chalkboard)
-    title_color_rgb = text_rgb
-    try:
-        if _contrast_ratio(tuple(ornament_fill), tuple(text_rgb)) < 4.5:
-            # Use dark background color (theme bg) for text when ornament is too light
-            title_color_rgb = _hex_to_rgb_int(theme["colors"]["bg"])
-    except Exception:
-        title_color_rgb = text_rgb
-
     _add_textbox(
         slide,
-        ornament_left,
-        ornament_top,
-        ornament_w,
-        ornament_h,
+        *ornament_box,
         title_text,
-        title_font,
+        ctx.title_font,
         display_size,
-        title_color_rgb,
+        title_color,
         bold=True,
         alignment=PP_ALIGN.CENTER,
         vertical_anchor=MSO_ANCHOR.MIDDLE,
@@ -300,90 +474,69 @@ def _title_splash(prs: Presentation, plan: LecturePlan, theme: Dict[str, Any], s
 
 
 def _content_slide(prs: Presentation, slide_item: SlideItem, theme: Dict[str, Any], 
-                   sizes: Dict[str, float]) -> int:
+                   ctx: LayoutCtx, bg: _DeckBackground) -> int:
     """Create slide(s) with heading + bullet points. Returns number of slides created."""
     points = slide_item.points or []
     if not points:
         return 0
     
-    frame_left, frame_top, frame_w, frame_h = _get_safe_frame(prs, theme)
-    
-    # Compute max bullets per slide
-    layout = theme.get("layout", {})
-    body_size = sizes["body"]
-    leading = body_size * layout.get("bullet_leading", 1.35)
-    para_gap = layout.get("para_gap_pt", 10)
-    
-    line_h_in = (leading + para_gap) / 72.0
-    available_h = frame_h - 1.5  # More space reserved for title
-    max_bullets = max(4, int(available_h / line_h_in))
-    
     created = 0
     start = 0
     
     while start < len(points):
         slide = prs.slides.add_slide(prs.slide_layouts[6])
-        _add_background(slide, prs, theme)
-        
-        # Title band - with more top padding
-        title_font = theme["fonts"].get("title", "Helvetica-Bold")
-        text_rgb = _hex_to_rgb_int(theme["colors"]["text"])
-        band_h = 1.0  # Increased height
-        title_top = frame_top + 0.3  # Added top padding
+        _add_background(slide, prs, theme, bg)
         
         title_text = slide_item.title if created == 0 else f"{slide_item.title} (cont.)"
         
         _add_textbox(
             slide,
-            frame_left,
-            title_top,
-            frame_w,
-            band_h,
+            ctx.frame_left_emu,
+            ctx.title_top_emu,
+            ctx.frame_w_emu,
+            ctx.band_h_emu,
             title_text,
-            title_font,
-            sizes["title"],
-            text_rgb,
+            ctx.title_font,
+            ctx.title_size,
+            ctx.text_color,
             bold=True,
             alignment=PP_ALIGN.LEFT,
             vertical_anchor=MSO_ANCHOR.TOP
         )
         
-        # Bullets area - starts lower to account for title padding
-        bullets_top = title_top + band_h + 0.3  # More gap after title
-        bullets_h = frame_h - (bullets_top - frame_top)
-        
+        # Bullets area
         tb = slide.shapes.add_textbox(
-            Inches(frame_left), Inches(bullets_top),
-            Inches(frame_w), Inches(bullets_h)
+            ctx.frame_left_emu, ctx.bullets_top_emu,
+            ctx.frame_w_emu, ctx.bullets_h_emu
         )
         tf = tb.text_frame
         tf.clear()
         tf.word_wrap = True
-        tf.margin_left = Inches(0.2)
-        tf.margin_right = Inches(0.2)
-        tf.margin_top = Inches(0)
+        tf.margin_left = _BULLET_MARGIN_EMU
+        tf.margin_right = _BULLET_MARGIN_EMU
+        tf.margin_top = 0
         
         # Add bullets
-        end = min(len(points), start + max_bullets)
-        body_font = theme["fonts"].get("body", "Helvetica")
-        theme_key = theme.get("name", "minimalist")
+        end = min(len(points), start + ctx.max_bullets)
         
-        for idx in range(start, end):
-            ptext = points[idx]
-            icon = get_point_icon(theme_key, idx - start)
-            
-            if idx == start:
-                p = tf.paragraphs[0]
-            else:
-                p = tf.add_paragraph()
-            
-            p.text = f"{icon} {ptext}"
-            p.level = 0
-            p.font.size = Pt(body_size)
-            p.font.color.rgb = RGBColor(*text_rgb)
-            p.font.name = body_font
-            p.space_after = Pt(para_gap)
-            p.line_spacing = leading / body_size
+        # every bullet in one text assignment; "\n" splits paragraphs, so a
+        # line feed inside a point becomes "\v" (a line break, as p.text does)
+        tf.text = "\n".join(
+            f"{ctx.icons[idx - start]} {points[idx]}".replace("\n", "\v") for idx in range(start, end)
+        )
+        
+        # format the first bullet; the rest get copies of its <a:pPr>
+        paras = tf.paragraphs
+        p = paras[0]
+        p.level = 0
+        p.font.size = Pt(ctx.body_size)
+        p.font.color.rgb = ctx.text_color
+        p.font.name = ctx.body_font
+        p.space_after = Pt(ctx.para_gap)
+        p.line_spacing = ctx.line_spacing
+        pPr = p._p.pPr
+        for other in paras[1:]:
+            other._p.insert(0, deepcopy(pPr))
         
         start = end
         created += 1
@@ -394,30 +547,29 @@ def _content_slide(prs: Presentation, slide_item: SlideItem, theme: Dict[str, An
 # --- Footer ----------------------------------------------------------------
 
 def _add_footer(slide, prs: Presentation, plan: LecturePlan, page_num: int, 
-               total_pages: int, theme: Dict[str, Any], sizes: Dict[str, float]):
-    """Add footer with page number and topic."""
-    frame_left, frame_top, frame_w, frame_h = _get_safe_frame(prs, theme)
-    layout = theme.get("layout", {})
-    
-    footer_y = prs.slide_height.inches - _px_to_inches(layout.get("safe_bottom", 48)) - 0.3
-    
+               total_pages: int, ctx: LayoutCtx, template=None):
+    """Add footer with page number and topic.
+
+    Returns the footer shape elements; pass them back as template for the next
+    slide to clone them (only the folio text changes) instead of rebuilding.
+    Returns None when the footer cannot be cloned that way.
+    """
+    folio = f"{plan.topic} • {page_num}/{total_pages}"
+    if template is not None:
+        return _clone_footer(slide, template, folio)
+
     # Divider line
-    muted_rgb = _hex_to_rgb_int(theme["colors"]["muted"])
     divider = slide.shapes.add_shape(
         MSO_SHAPE.RECTANGLE,
-        Inches(frame_left), Inches(footer_y),
-        Inches(frame_w), Inches(0.01)
+        ctx.frame_left_emu, ctx.footer_top_emu,
+        ctx.frame_w_emu, _DIVIDER_H_EMU
     )
     divider.fill.solid()
-    divider.fill.fore_color.rgb = RGBColor(*muted_rgb)
+    divider.fill.fore_color.rgb = ctx.muted_color
     divider.line.fill.background()
     
-    # Footer text
-    footer_font = theme["fonts"].get("body", "Helvetica")
-    folio = f"{plan.topic} • {page_num}/{total_pages}"
-    
     # Theme-specific alignment
-    theme_key = theme.get("name", "minimalist")
+    theme_key = ctx.theme_key
     if theme_key == "minimalist":
         align = PP_ALIGN.CENTER
     elif theme_key == "chalkboard":
@@ -425,64 +577,105 @@ def _add_footer(slide, prs: Presentation, plan: LecturePlan, page_num: int,
     else:  # corporate
         align = PP_ALIGN.RIGHT
     
-    _add_textbox(
+    tb = _add_textbox(
         slide,
-        frame_left,
-        footer_y + 0.05,
-        frame_w,
-        0.3,
+        ctx.frame_left_emu,
+        ctx.footer_text_top_emu,
+        ctx.frame_w_emu,
+        _FOOTER_H_EMU,
         folio,
-        footer_font,
-        sizes["footer"],
-        muted_rgb,
+        ctx.body_font,
+        ctx.footer_size,
+        ctx.muted_color,
         alignment=align
     )
 
+    # a folio with line breaks spans several runs; keep building those from scratch
+    if len(list(tb.element.iter(qn("a:t")))) != 1:
+        return None
+    return (deepcopy(divider.element), deepcopy(tb.element))
+
+
+def _clone_footer(slide, template, folio: str):
+    for el in template:
+        sp = deepcopy(el)
+        for t in sp.iter(qn("a:t")):
+            t.text = folio
+        _append_shape(slide, sp)
+    return template
+
+
+def _append_shape(slide, el) -> None:
+    """Append a copied shape element to slide's shape tree under a fresh id.
+
+    Plain lxml on slide.shapes.element; the id and name are assigned the way
+    python-pptx numbers shapes it creates itself.
+    """
+    sp_tree = slide.shapes.element
+    shape_id = max((int(v) for v in sp_tree.xpath("//@id") if v.isdigit()), default=0) + 1
+    c_nv_pr = next(el.iter(qn("p:cNvPr")))
+    c_nv_pr.set("id", str(shape_id))
+    c_nv_pr.set("name", f"{c_nv_pr.get('name').rsplit(' ', 1)[0]} {shape_id - 1}")
+    ext_lst = sp_tree.find(qn("p:extLst"))
+    if ext_lst is not None:
+        ext_lst.addprevious(el)
+    else:
+        sp_tree.append(el)
+
 
 # --- Main Builder ----------------------------------------------------------
 
+def _load_default_pptx_template_bytes() -> bytes:
+    """Read python-pptx's built-in default.pptx (what Presentation() opens) into memory."""
+    path = os.path.join(os.path.dirname(pptx.__file__), "templates", "default.pptx")
+    with open(path, "rb") as fh:
+        return fh.read()
+
+
+# read once at import; every deck opens its own BytesIO over these bytes
+_TEMPLATE_BYTES = _load_default_pptx_template_bytes()
+
+
 def build_pptx(plan: LecturePlan, theme: Optional[Dict[str, Any]] = None) -> bytes:
     """Build themed PPTX from LecturePlan - heading + bullets only."""
+    # getvalue() hands over the stream's buffer without another copy
+    return build_pptx_stream(plan, theme).getvalue()
+
+
+def build_pptx_stream(plan: LecturePlan, theme: Optional[Dict[str, Any]] = None) -> BytesIO:
+    """Same deck as build_pptx, as a BytesIO rewound to 0 (e.g. for StreamingResponse)."""
     theme = theme or get_theme(plan.theme)
     
     # Add theme name for icon helpers
     theme["name"] = (plan.theme or "minimalist").lower()
     
-    prs = Presentation()
+    prs = Presentation(BytesIO(_TEMPLATE_BYTES))
     _configure_slide_size(prs, plan)
     
-    # Compute adaptive sizes
+    # Compute adaptive sizes, then every per-deck layout constant once
     sizes = _compute_scale_and_sizes(prs, theme)
+    ctx = _layout_ctx(prs, theme, sizes)
+    bg = _deck_background(prs, theme)
     
-    # Count total pages
-    total_pages = 1  # Title splash
-    for slide_item in plan.slides:
-        points_count = len(slide_item.points or [])
-        body_size = sizes["body"]
-        leading = body_size * theme.get("layout", {}).get("bullet_leading", 1.35)
-        para_gap = theme.get("layout", {}).get("para_gap_pt", 10)
-        line_h_in = (leading + para_gap) / 72.0
-        frame_left, frame_top, frame_w, frame_h = _get_safe_frame(prs, theme)
-        available_h = frame_h - 1.2
-        max_bullets = max(4, int(available_h / line_h_in))
-        total_pages += math.ceil(points_count / max_bullets)
+    # Count total pages: title splash + one page per max_bullets points (as _content_slide splits them)
+    total_pages = 1 + sum(-(-len(s.points or []) // ctx.max_bullets) for s in plan.slides)
     
     page_num = 0
     
     # Title splash
-    _title_splash(prs, plan, theme, sizes)
+    _title_splash(prs, plan, theme, ctx, bg)
     page_num += 1
-    _add_footer(prs.slides[page_num - 1], prs, plan, page_num, total_pages, theme, sizes)
+    footer = _add_footer(prs.slides[page_num - 1], prs, plan, page_num, total_pages, ctx)
     
     # Content slides (heading + bullets only)
     for slide_item in plan.slides:
-        slides_created = _content_slide(prs, slide_item, theme, sizes)
+        slides_created = _content_slide(prs, slide_item, theme, ctx, bg)
         for i in range(slides_created):
             page_num += 1
-            _add_footer(prs.slides[page_num - 1], prs, plan, page_num, total_pages, theme, sizes)
+            footer = _add_footer(prs.slides[page_num - 1], prs, plan, page_num, total_pages, ctx, footer)
     
-    # Save to bytes
+    # Save to an in-memory stream
     out = BytesIO()
     prs.save(out)
     out.seek(0)
-    return out.getvalue()
\ No newline at end of file
+    return out
\ No newline at end of file
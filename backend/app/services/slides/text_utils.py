@@ -1,8 +1,16 @@
 """Text utilities for processing and de-duplicating content."""
 import re
 import string
-from typing import Set, List
-from difflib import SequenceMatcher
+from typing import FrozenSet, Set, List
+
+# Punctuation to drop when normalizing; hyphens and apostrophes stay inside words
+_PUNCT_TABLE = str.maketrans('', '', ''.join(c for c in string.punctuation if c not in "-'"))
+_WS_RE = re.compile(r'\s+')
+_SENT_SPLIT = re.compile(r'[.!?]+')
+
+# Word-set Jaccard at or above which two sentences count as duplicates: one word
+# swapped in a ten-word sentence (9/11) still matches.
+_NEAR_DUP_JACCARD = 0.8
 
 def normalize_sentence(s: str) -> str:
     """
@@ -14,38 +22,40 @@ def normalize_sentence(s: str) -> str:
     Returns:
         Normalized sentence string
     """
-    # Convert to lowercase and strip whitespace
-    s = s.lower().strip()
-    
-    # Remove punctuation except hyphens and apostrophes in words
-    s = re.sub(f'[{re.escape(string.punctuation.replace("-", "").replace("'", ""))}]', '', s)
+    # Lowercase, strip, and remove punctuation except hyphens and apostrophes in words
+    s = s.lower().strip().translate(_PUNCT_TABLE)
     
     # Normalize spaces
-    s = re.sub(r'\s+', ' ', s)
-    
-    return s
+    return _WS_RE.sub(' ', s)
+
+def _token_set(s: str) -> FrozenSet[str]:
+    """Word set of a sentence after normalize_sentence."""
+    return frozenset(normalize_sentence(s).split())
 
-def is_near_duplicate(a: str, b: str, threshold: float = 0.9) -> bool:
+def _jaccard(a: FrozenSet[str], b: FrozenSet[str]) -> float:
+    union = len(a | b)
+    return len(a & b) / union if union else 1.0
+
+def _near_dup_tokens(a: FrozenSet[str], b: FrozenSet[str], threshold: float = _NEAR_DUP_JACCARD) -> bool:
+    # Jaccard can't exceed min/max of the set sizes; skip the set ops when that already fails
+    la, lb = len(a), len(b)
+    if la != lb and min(la, lb) < threshold * max(la, lb):
+        return False
+    return _jaccard(a, b) >= threshold
+
+def is_near_duplicate(a: str, b: str, threshold: float = _NEAR_DUP_JACCARD) -> bool:
     """
-    Check if two strings are near-duplicates using sequence matching.
+    Check if two strings are near-duplicates by the overlap of their word sets.
     
     Args:
         a: First string
         b: Second string
-        threshold: Similarity threshold (0-1, default 0.9)
+        threshold: Jaccard similarity threshold (0-1, default 0.8)
         
     Returns:
         True if strings are similar enough to be considered duplicates
     """
-    # Normalize both strings first
-    a_norm = normalize_sentence(a)
-    b_norm = normalize_sentence(b)
-    
-    # Use sequence matcher to compute similarity
-    matcher = SequenceMatcher(None, a_norm, b_norm)
-    ratio = matcher.ratio()
-    
-    return ratio >= threshold
+    return _near_dup_tokens(_token_set(a), _token_set(b), threshold)
 
 def deduplicate_content(
     narrative: str,
@@ -63,62 +73,58 @@ def deduplicate_content(
     Returns:
         Tuple of (filtered_narrative, filtered_concepts, filtered_details)
     """
-    # Build set of normalized narrative sentences
-    seen_sentences: Set[str] = set()
+    # Build set of narrative sentence word sets (tokenized once, compared by Jaccard)
+    seen_sentences: Set[FrozenSet[str]] = set()
     
-    # Split narrative into sentences and normalize each
-    for sentence in re.split(r'[.!?]+', narrative):
+    # Split narrative into sentences and tokenize each
+    for sentence in _SENT_SPLIT.split(narrative):
         if sentence.strip():
-            seen_sentences.add(normalize_sentence(sentence))
+            seen_sentences.add(_token_set(sentence))
     
     # Filter key concepts
     filtered_concepts = []
     for concept in key_concepts:
-        normalized = normalize_sentence(concept)
+        tokens = _token_set(concept)
         is_duplicate = False
         
         # Check against narrative sentences
         for seen in seen_sentences:
-            if is_near_duplicate(normalized, seen):
+            if _near_dup_tokens(tokens, seen):
                 is_duplicate = True
                 break
                 
         if not is_duplicate and len(concept) <= 160:
             filtered_concepts.append(concept)
-            seen_sentences.add(normalized)
+            seen_sentences.add(tokens)
     
     # Ensure we have minimum required concepts
     filtered_concepts = filtered_concepts[:6]  # Max 6
     if len(filtered_concepts) < 3:
         # We should regenerate concepts, but for now keep originals
-        filtered_concepts.extend(
-            concept for concept in key_concepts 
-            if concept not in filtered_concepts
-        )[:3]
+        kept = set(filtered_concepts)
+        filtered_concepts += [concept for concept in dict.fromkeys(key_concepts) if concept not in kept][:3 - len(filtered_concepts)]
     
     # Filter supporting details
     filtered_details = []
     for detail in supporting_details:
-        normalized = normalize_sentence(detail)
+        tokens = _token_set(detail)
         is_duplicate = False
         
         # Check against all previous content
         for seen in seen_sentences:
-            if is_near_duplicate(normalized, seen):
+            if _near_dup_tokens(tokens, seen):
                 is_duplicate = True
                 break
                 
         if not is_duplicate and len(detail) <= 160:
             filtered_details.append(detail)
-            seen_sentences.add(normalized)
+            seen_sentences.add(tokens)
     
     # Ensure minimum required details
     filtered_details = filtered_details[:6]  # Max 6
     if len(filtered_details) < 3:
         # We should regenerate details, but for now keep originals
-        filtered_details.extend(
-            detail for detail in supporting_details 
-            if detail not in filtered_details
-        )[:3]
+        kept = set(filtered_details)
+        filtered_details += [detail for detail in dict.fromkeys(supporting_details) if detail not in kept][:3 - len(filtered_details)]
     
     return narrative, filtered_concepts, filtered_details
\ No newline at end of file
@@ -1,19 +1,24 @@
 """
 Cover thumbnail renderer using Pillow.
 """
+from functools import lru_cache
 from io import BytesIO
 from PIL import Image, ImageDraw, ImageFont
 from typing import Tuple, Dict, Any
 import random
 
+import numpy as np
+
 # diagram_draw.hex_to_rgb returns normalized floats (0..1). For Pillow we need 0..255 ints.
 
 
+@lru_cache(maxsize=64)
 def _hex_to_rgb_int(hex_color: str):
     hc = (hex_color or "#000000").lstrip("#")
     if len(hc) != 6:
         raise ValueError(f"Invalid hex color: {hex_color}")
-    return tuple(int(hc[i : i + 2], 16) for i in (0, 2, 4))
+    v = int(hc, 16)
+    return ((v >> 16) & 0xFF, (v >> 8) & 0xFF, v & 0xFF)
 
 
 def render_cover_thumbnail(
@@ -39,21 +44,15 @@ def render_cover_thumbnail(
     big_w = width * SS
     big_h = height * SS
 
-    # Create high-res base image
-    img = Image.new("RGB", (big_w, big_h), color=_hex_to_rgb_int(theme["colors"]["bg"]))
-    draw = ImageDraw.Draw(img, "RGBA")
-
-    # Draw gradient background (vertical)
+    # Draw gradient background (vertical): a one-pixel column stretched across the width
     gradient_stops = theme.get("background_gradient", (theme["colors"]["bg"], theme["colors"].get("paper", theme["colors"]["bg"])))
-    color1 = _hex_to_rgb_int(gradient_stops[0])
-    color2 = _hex_to_rgb_int(gradient_stops[1])
-
-    for y in range(big_h):
-        ratio = y / max(1, big_h - 1)
-        r = int(round(color1[0] * (1 - ratio) + color2[0] * ratio))
-        g = int(round(color1[1] * (1 - ratio) + color2[1] * ratio))
-        b = int(round(color1[2] * (1 - ratio) + color2[2] * ratio))
-        draw.line([(0, y), (big_w, y)], fill=(r, g, b))
+    color1 = np.array(_hex_to_rgb_int(gradient_stops[0]), dtype=np.float64)
+    color2 = np.array(_hex_to_rgb_int(gradient_stops[1]), dtype=np.float64)
+
+    ratio = np.arange(big_h, dtype=np.float64)[:, None] / max(1, big_h - 1)
+    rows = np.rint(color1 * (1 - ratio) + color2 * ratio).astype(np.uint8)
+    img = Image.fromarray(rows[:, None, :]).resize((big_w, big_h), resample=Image.NEAREST)
+    draw = ImageDraw.Draw(img, "RGBA")
 
     # Add subtle noise overlay for depth
     noise_layer = Image.new("RGBA", (big_w, big_h), (0, 0, 0, 0))
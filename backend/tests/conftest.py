@@ -0,0 +1,5 @@
+import sys
+from pathlib import Path
+
+# tests import the app the same way scripts/ does: from the backend root
+sys.path.insert(0, str(Path(__file__).resolve().parents[1]))
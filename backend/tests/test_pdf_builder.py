@@ -0,0 +1,76 @@
+import asyncio
+
+import pytest
+
+from app.schemas.slides import LecturePlan, SlideItem
+from app.services.slides.pdf_builder import _expand_points, build_pdf
+from app.services.slides.pdf_builder import _EXPANSION_SUFFIXES
+from app.services.slides.theme_tokens import get_theme
+
+
+def _plan(theme="chalkboard", n=3):
+    return LecturePlan(
+        topic="Sorting",
+        theme=theme,
+        duration_minutes=5,
+        slides=[
+            SlideItem(index=i, title=f"Slide {i}", points=["Quick sort partitions", "Merge sort merges"])
+            for i in range(n)
+        ],
+    )
+
+
+def test_draft_points_are_not_expanded():
+    assert _expand_points(["Heaps", "Tries"], draft=True) == ["Heaps.", "Tries."]
+    full = _expand_points(["Heaps"])
+    assert full[0].startswith("Heaps") and full[0][len("Heaps"):] in _EXPANSION_SUFFIXES
+
+
+def test_draft_pdf_skips_vignette_and_filler():
+    plan = _plan()
+    full = build_pdf(plan, get_theme("chalkboard"), compress=False)
+    draft = build_pdf(plan, get_theme("chalkboard"), draft=True, compress=False)
+
+    assert draft.startswith(b"%PDF") and full.startswith(b"%PDF")
+    # the vignette is the only raster on these pages
+    assert b"/Subtype /Image" in full
+    assert b"/Subtype /Image" not in draft
+    for suffix in _EXPANSION_SUFFIXES:
+        assert suffix[2:12].encode() not in draft
+
+
+def test_draft_does_not_touch_caller_theme():
+    theme = get_theme("chalkboard")
+    strength = theme["vignette"]["strength"]
+    build_pdf(_plan(), theme, draft=True)
+    assert theme["vignette"]["strength"] == strength
+
+
+@pytest.fixture
+def pdf_router():
+    # the router pulls in fastapi, boto3, the Gemini client and env-backed settings
+    try:
+        from app.routers import pdf_generation
+    except Exception as exc:  # missing deps or .env
+        pytest.skip(f"router not importable here: {exc}")
+    return pdf_generation
+
+
+def test_router_passes_draft_through(pdf_router, monkeypatch, tmp_path):
+    from fastapi import BackgroundTasks
+
+    seen = {}
+
+    def fake_build(**kwargs):
+        seen.update(kwargs)
+        kwargs["out"].write(b"%PDF-")
+
+    monkeypatch.setattr(pdf_router, "OUTDIR", tmp_path)
+    monkeypatch.setattr(pdf_router, "generate_slides", lambda *a: (None, [{"title": "A", "points": ["x"]}]))
+    monkeypatch.setattr(pdf_router, "build_pdf_to", fake_build)
+    monkeypatch.setattr(pdf_router, "_upload_pdf_to_r2", lambda path, key: f"https://cdn/{key}")
+
+    req = pdf_router.PDFGenerationRequest(topic="T", audience="A", length="5 min", draft=True)
+    asyncio.run(pdf_router.generate_pdf(req, BackgroundTasks()))
+    assert seen["draft"] is True
+    assert pdf_router.PDFGenerationRequest(topic="T", audience="A", length="5").draft is False
@@ -0,0 +1,89 @@
+import re
+
+import pytest
+
+from app.schemas.slides import LecturePlan, SlideItem
+from app.services.slides import pdf_enhanced as pe
+from app.services.slides.theme_tokens import get_theme
+
+TOP, BOTTOM, WIDTH = 700.0, 80.0, 420.0
+
+
+@pytest.fixture
+def rt():
+    return pe._get_resolved_theme(get_theme("minimalist"), 1.0)
+
+
+def _lines_by_header(sections):
+    out = {}
+    for sec in sections:
+        out.setdefault(sec.header, []).extend(ln for unit in sec.units for ln in unit)
+    return out
+
+
+def _assert_fits(page, rt):
+    # replay _draw_sections' cursor: every line box must end above the bottom margin
+    y = TOP
+    for sec in page:
+        y -= rt.hdr_advance
+        for unit in sec.units:
+            y -= sec.leading * len(unit)
+            assert y >= BOTTOM - 1e-6
+            y -= sec.unit_gap
+        y -= rt.section_gap
+
+
+def _paginate(rt, view):
+    measured = pe._measure_expanded_height(rt, view, WIDTH)
+    return measured, pe._paginate_sections(measured, rt, TOP, BOTTOM)
+
+
+def test_short_slide_stays_on_one_page(rt):
+    view = pe._SlideView("Small", "short overview", ["a concept"], ["a detail"])
+    measured, pages = _paginate(rt, view)
+    assert len(pages) == 1
+    assert [sec for sec, _ in measured] == pages[0]
+
+
+def test_long_sections_split_between_units_without_losing_lines(rt):
+    view = pe._SlideView(
+        "Big",
+        ["Paragraph %d. " % i + "word " * 120 for i in range(8)],
+        ["concept " * (i + 3) for i in range(12)],
+        ["d %d" % i for i in range(10)],
+    )
+    measured, pages = _paginate(rt, view)
+    assert len(pages) > 1
+    for page in pages:
+        assert page
+        _assert_fits(page, rt)
+    assert _lines_by_header(s for page in pages for s in page) == _lines_by_header(s for s, _ in measured)
+
+
+def test_unit_taller_than_a_page_is_split_by_lines(rt):
+    view = pe._SlideView("Huge", [], [], ["detail " * 1500])
+    measured, pages = _paginate(rt, view)
+    assert len(pages) > 2
+    for page in pages:
+        _assert_fits(page, rt)
+    assert _lines_by_header(s for page in pages for s in page) == _lines_by_header(s for s, _ in measured)
+    # the header repeats on every page; only the first piece of the item gets a marker
+    assert all(page[0].header == "Examples & Pitfalls" for page in pages)
+    assert [page[0].marked for page in pages] == [True] + [False] * (len(pages) - 1)
+
+
+def test_continuation_pages_get_cont_title():
+    big = SlideItem.model_construct(
+        title="Big", points=[], expanded_content="giant " * 3000, key_concepts=[], supporting_details=[],
+    )
+    small = SlideItem.model_construct(
+        title="Small", points=[], expanded_content="short", key_concepts=["a"], supporting_details=[],
+    )
+    plan = LecturePlan.model_construct(topic="T", slides=[big, small], theme="minimalist")
+    data = pe.build_enhanced_pdf(plan, get_theme("minimalist"), compress=False)
+
+    # band titles, in page order (PDF strings escape the parentheses)
+    titles = [t.replace(b"\\", b"") for t in re.findall(rb"Tm \(((?:Big|Small)(?: \\\(cont\.\\\))?)\) Tj", data)]
+    assert titles[0] == b"Big"
+    assert len(titles) > 2 and set(titles[1:-1]) == {b"Big (cont.)"}
+    assert titles[-1] == b"Small"
@@ -0,0 +1,60 @@
+import zipfile
+from io import BytesIO
+
+import pytest
+from pptx import Presentation
+from pptx.enum.shapes import MSO_SHAPE_TYPE
+from pptx.oxml.ns import qn
+
+from app.schemas.slides import LecturePlan, SlideItem
+from app.services.slides.pptx_builder import build_pptx
+
+
+def _plan(theme="corporate", n=6):
+    return LecturePlan(
+        topic="Graphs",
+        theme=theme,
+        duration_minutes=10,
+        slides=[
+            SlideItem(index=i, title=f"Slide {i}", points=[f"point {j} of slide {i}" for j in range(5)])
+            for i in range(n)
+        ],
+    )
+
+
+def _deck(plan):
+    return Presentation(BytesIO(build_pptx(plan)))
+
+
+@pytest.mark.parametrize("theme", ["minimalist", "chalkboard", "corporate"])
+def test_cloned_footers_get_unique_shape_ids(theme):
+    prs = _deck(_plan(theme))
+    total = len(prs.slides)
+    assert total == 7
+    for n, slide in enumerate(prs.slides, start=1):
+        ids = [shape.shape_id for shape in slide.shapes]
+        names = [shape.name for shape in slide.shapes]
+        assert len(ids) == len(set(ids))
+        assert len(names) == len(set(names))
+        # every id on the slide, including non-shape elements, is distinct
+        all_ids = slide.shapes.element.xpath("//@id")
+        assert len(all_ids) == len(set(all_ids))
+        assert [s.text_frame.text for s in slide.shapes if s.has_text_frame][-1] == f"Graphs • {n}/{total}"
+
+
+@pytest.mark.parametrize("theme", ["minimalist", "chalkboard", "corporate"])
+def test_background_picture_shares_one_image_part(theme):
+    data = build_pptx(_plan(theme))
+    names = zipfile.ZipFile(BytesIO(data)).namelist()
+    assert len(names) == len(set(names))
+    assert [n for n in names if n.startswith("ppt/media/")] == ["ppt/media/image1.png"]
+
+    prs = Presentation(BytesIO(data))
+    parts = set()
+    for slide in prs.slides:
+        bg = slide.shapes[0]
+        assert bg.shape_type == MSO_SHAPE_TYPE.PICTURE
+        assert (bg.left, bg.top, bg.width, bg.height) == (0, 0, prs.slide_width, prs.slide_height)
+        r_id = next(bg.element.iter(qn("a:blip"))).get(qn("r:embed"))
+        parts.add(slide.part.rels[r_id].target_part.partname)
+    assert parts == {"/ppt/media/image1.png"}
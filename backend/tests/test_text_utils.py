@@ -0,0 +1,34 @@
+from app.services.slides.text_utils import deduplicate_content, is_near_duplicate
+
+
+def test_near_duplicate_uses_word_overlap():
+    assert is_near_duplicate("Graphs store nodes and edges.", "graphs store nodes, and edges")
+    assert not is_near_duplicate("Graphs store nodes and edges.", "Trees have a single root node.")
+
+
+def test_concepts_already_in_narrative_are_dropped():
+    narrative = "Graphs store nodes and edges. A tree is a connected acyclic graph."
+    concepts = [
+        "Graphs store nodes and edges",
+        "BFS visits nodes level by level",
+        "DFS follows one branch to its end",
+        "Dijkstra finds shortest weighted paths",
+    ]
+    _, kept, _ = deduplicate_content(narrative, concepts, [])
+    assert kept == concepts[1:]
+
+
+def test_top_up_to_three_keeps_order():
+    narrative = "Graphs store nodes and edges. BFS visits nodes level by level."
+    concepts = ["Graphs store nodes and edges", "BFS visits nodes level by level", "DFS uses a stack"]
+    _, kept, _ = deduplicate_content(narrative, concepts, [])
+    assert kept == ["DFS uses a stack", "Graphs store nodes and edges", "BFS visits nodes level by level"]
+
+
+def test_top_up_does_not_repeat_duplicated_inputs():
+    narrative = "Graphs store nodes and edges. BFS visits nodes level by level."
+    concepts = ["Graphs store nodes and edges", "Graphs store nodes and edges", "BFS visits nodes level by level"]
+    details = ["BFS visits nodes level by level"] * 3
+    _, kept_concepts, kept_details = deduplicate_content(narrative, concepts, details)
+    assert kept_concepts == ["Graphs store nodes and edges", "BFS visits nodes level by level"]
+    assert kept_details == ["BFS visits nodes level by level"]